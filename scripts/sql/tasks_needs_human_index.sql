@@ -0,0 +1,14 @@
+-- Index backing fetch_automated_tasks: it filters on needs_human = false
+-- and orders by created_at, so give Postgres a composite index matching
+-- that shape instead of a sequential scan over the whole table.
+--
+-- A GENERATED ALWAYS column deriving needs_human from the title was
+-- considered and rejected: the application inserts needs_human explicitly
+-- (the Python classifier is authoritative, and a generated column rejects
+-- explicit writes), and keeping the keyword list in one place - code -
+-- avoids a second copy drifting inside a migration.
+--
+-- Apply via the Supabase SQL editor or `supabase db push`.
+
+create index if not exists tasks_needs_human_created_at_idx
+  on tasks (needs_human, created_at);
@@ -1,33 +1,130 @@
 """
 ChatGPT API service for knowledge base processing.
 """
+import asyncio
 import os
 import json
-from typing import Optional
-from openai import OpenAI
+import random
+import re
+import time
+from typing import List, Optional
+from openai import (
+    AsyncOpenAI,
+    OpenAI,
+    APIConnectionError,
+    APITimeoutError,
+    AuthenticationError,
+    InternalServerError,
+    RateLimitError,
+)
 from src.models import KnowledgeBase, SlackMessage, Fact
 from src.logger import KnowledgeLogger
+from src.kb_update_cache import KBUpdateCache, knowledge_base_hash
+from src.rate_limiter import RateLimiter, estimate_tokens
 
 
 class ChatGPTService:
     """Service for interacting with ChatGPT API for knowledge base updates."""
-    
+
+    # Sentinel line separating per-message tables in batched responses
+    BATCH_SENTINEL = "=====FACTS {i}====="
+
+    # Compiled once; parsing is a single C-level pass over the whole response
+    # instead of per-line Python splitting and stripping
+    _TITLE_RE = re.compile(r'^#\s+([^\n#][^\n]*)', re.M)
+    # Number may come back bold or plain (models drop the ** occasionally);
+    # the date match is anchored to the exact YYYY-MM-DD shape
+    _ROW_RE = re.compile(r'^\|\s*\*{0,2}(\d+)\*{0,2}\s*\|\s*(.+?)\s*\|\s*(\d{4}-\d{2}-\d{2})\s*\|\s*$', re.M)
+
+    # Transient failures worth retrying; 400s and auth errors are not here on
+    # purpose - those are bugs or config problems and should surface at once
+    RETRYABLE_ERRORS = (RateLimitError, APITimeoutError, APIConnectionError, InternalServerError)
+    MAX_ATTEMPTS = 4
+
+    # Above this fact count, send only the facts relevant to the Slack message
+    # and splice the model's reply back into the full KB locally
+    RELEVANCE_KB_THRESHOLD = 20
+    RELEVANCE_TOP_K = 8
+
+    _WORD_RE = re.compile(r'[a-z][a-z0-9]{2,}')
+    _NUMBER_RE = re.compile(r'\d[\d,.]*')
+    _FACT_REF_RE = re.compile(r'\bfact\s*#?\s*(\d+)', re.I)
+
     def __init__(self, logger: KnowledgeLogger):
         self.logger = logger
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        api_key = os.getenv("OPENAI_API_KEY")
+        self.client = OpenAI(api_key=api_key)
+        # Shared async client - one httpx connection pool for all concurrent calls
+        self.aclient = AsyncOpenAI(api_key=api_key)
         self.model = "gpt-4o"  # Switch to gpt-4o for reliable performance within timeout limits
+        # Decided once: reasoning models take no system message/temperature
+        # and use max_completion_tokens. The model name never changes after
+        # construction, so re-checking prefixes per call is wasted work.
+        self.is_reasoning_model = self.model.startswith(("o1", "o3"))
         self.temperature = 0.1  # Low temperature for consistent, factual responses
+        # Semantic cache: repeat/near-identical Slack messages skip the LLM call
+        self.update_cache = KBUpdateCache(self.client, logger)
+        # (guidelines, system prompt) - kept byte-identical for prefix caching
+        self._system_prompt_cache = None
+        # Proactive throttle: never submit requests that would 429
+        self.rate_limiter = RateLimiter()
         
+    def _knowledge_update_system_prompt(self, guidelines: str) -> str:
+        """Build the system message: instructions, guidelines and output format.
+
+        Everything here is identical across calls (for a given guidelines
+        text), so OpenAI's server-side prefix cache hits on the whole block.
+        The result is memoized on the instance to keep it byte-identical.
+        """
+        if self._system_prompt_cache is not None and self._system_prompt_cache[0] == guidelines:
+            return self._system_prompt_cache[1]
+
+        system_prompt = f"""You are a precise fact-based knowledge management system. Your task is to update a knowledge base based on new information from a Slack message, following specific guidelines. Follow instructions exactly.
+
+## KNOWLEDGE MANAGEMENT GUIDELINES
+{guidelines}
+
+## YOUR TASK
+
+Analyze the Slack message and update the knowledge base according to the guidelines. You should:
+
+1. **Update existing facts** with new data where applicable (especially metrics and current status)
+2. **Add new facts** if the Slack message contains information not covered in existing facts
+3. **Update validation dates** to today's date (given in the user message) for any facts you modify or confirm
+4. **Maintain fact numbering** - use existing numbers for updated facts, assign new numbers for new facts
+5. **Follow all guidelines** especially regarding objectivity, temporal clarity, and fact completeness
+
+## OUTPUT FORMAT
+
+Respond with ONLY a properly formatted markdown table of the updated knowledge base, following this exact format:
+
+# Current RN Project Facts
+
+| **#** | **Fact** | **Time Last Validated** |
+| ----- | -------- | ----------------------- |
+| **1** | [Fact description] | [YYYY-MM-DD] |
+| **2** | [Fact description] | [YYYY-MM-DD] |
+
+Do not include any explanation, analysis, or additional text. Only return the updated knowledge base table."""
+
+        self._system_prompt_cache = (guidelines, system_prompt)
+        return system_prompt
+
     def _create_knowledge_update_prompt(
-        self, 
-        slack_message: SlackMessage, 
-        current_knowledge_base: KnowledgeBase, 
+        self,
+        slack_message: SlackMessage,
+        current_knowledge_base: KnowledgeBase,
         guidelines: str
     ) -> str:
-        """Create the prompt for ChatGPT to update the knowledge base."""
-        prompt = f"""You are a fact-based knowledge management system. Your task is to update a knowledge base based on new information from a Slack message, following specific guidelines.
+        """Create the volatile user prompt for ChatGPT to update the knowledge base.
 
-## INPUT INFORMATION
+        Only per-call content (current KB, Slack message, today's date) lives
+        here; the stable instructions and guidelines come from
+        _knowledge_update_system_prompt so the prefix cache stays warm.
+        """
+        prompt = f"""## INPUT INFORMATION
+
+Today's date: 2025-01-15
 
 ### Current Knowledge Base
 {current_knowledge_base.to_markdown()}
@@ -36,89 +133,324 @@ class ChatGPTService:
 Channel: {slack_message.channel or "Unknown"}
 User: {slack_message.user or "Unknown"}
 Message:
-{slack_message.content}
+{slack_message.content}"""
+
+        return prompt
+
+    def _create_batched_prompt(
+        self,
+        slack_messages: List[SlackMessage],
+        current_knowledge_base: KnowledgeBase,
+        guidelines: str
+    ) -> str:
+        """Create one prompt covering several Slack messages.
+
+        The shared knowledge base and guidelines are sent once and amortized
+        across all messages; the model emits one table per message separated
+        by a sentinel line.
+        """
+        message_blocks = []
+        for i, message in enumerate(slack_messages, 1):
+            message_blocks.append(
+                f"### New Information from Slack ({i})\n"
+                f"Channel: {message.channel or 'Unknown'}\n"
+                f"User: {message.user or 'Unknown'}\n"
+                f"Message:\n{message.content}"
+            )
+        messages_text = "\n\n".join(message_blocks)
+
+        prompt = f"""You are a fact-based knowledge management system. Your task is to update a knowledge base based on new information from {len(slack_messages)} separate Slack messages, following specific guidelines.
+
+## INPUT INFORMATION
+
+### Current Knowledge Base
+{current_knowledge_base.to_markdown()}
+
+{messages_text}
 
 ### Knowledge Management Guidelines
 {guidelines}
 
 ## YOUR TASK
 
-Analyze the Slack message and update the knowledge base according to the guidelines. You should:
-
-1. **Update existing facts** with new data where applicable (especially metrics and current status)
-2. **Add new facts** if the Slack message contains information not covered in existing facts
-3. **Update validation dates** to today's date (2025-01-15) for any facts you modify or confirm
-4. **Maintain fact numbering** - use existing numbers for updated facts, assign new numbers for new facts
-5. **Follow all guidelines** especially regarding objectivity, temporal clarity, and fact completeness
+For EACH numbered Slack message above, independently apply it to the current knowledge base according to the guidelines (update existing facts, add new facts, refresh validation dates, maintain fact numbering).
 
 ## OUTPUT FORMAT
 
-Respond with ONLY a properly formatted markdown table of the updated knowledge base, following this exact format:
+For each Slack message i, emit a line `=====FACTS i=====` followed by the complete updated knowledge base table in this exact format:
 
+{self.BATCH_SENTINEL.format(i=1)}
 # Current RN Project Facts
 
 | **#** | **Fact** | **Time Last Validated** |
 | ----- | -------- | ----------------------- |
 | **1** | [Fact description] | [YYYY-MM-DD] |
-| **2** | [Fact description] | [YYYY-MM-DD] |
 
-Do not include any explanation, analysis, or additional text. Only return the updated knowledge base table."""
+Do not include any explanation, analysis, or additional text. Only return the {len(slack_messages)} sentinel-separated knowledge base tables."""
 
         return prompt
-    
+
+    def _parse_many(self, response: str, k: int) -> Optional[List[KnowledgeBase]]:
+        """Split a batched response on the sentinel lines and parse each slice.
+
+        Returns None when the sentinels are missing so callers can fall back
+        to the single-call path.
+        """
+        slices = []
+        for i in range(1, k + 1):
+            start_marker = self.BATCH_SENTINEL.format(i=i)
+            start = response.find(start_marker)
+            if start == -1:
+                self.logger.warning(f"Batched response missing sentinel for message {i}")
+                return None
+            start += len(start_marker)
+            end_marker = self.BATCH_SENTINEL.format(i=i + 1)
+            end = response.find(end_marker, start)
+            slices.append(response[start:end if end != -1 else len(response)])
+
+        return [self._parse_knowledge_base_response(piece) for piece in slices]
+
+    def update_knowledge_base_batch(
+        self,
+        slack_messages: List[SlackMessage],
+        current_knowledge_base: KnowledgeBase,
+        guidelines: str
+    ) -> Optional[List[KnowledgeBase]]:
+        """
+        Apply several Slack messages with a single chat completion, paying the
+        knowledge base + guidelines prompt tokens once instead of per message.
+        Falls back to per-message calls if the batched response can't be split.
+        Returns None only if the fallback path also fails for every message.
+        """
+        if not slack_messages:
+            return []
+        if len(slack_messages) == 1:
+            result = self.update_knowledge_base(slack_messages[0], current_knowledge_base, guidelines)
+            return [result] if result else None
+
+        try:
+            self.logger.info(f"Starting batched knowledge base update for {len(slack_messages)} messages")
+
+            prompt = self._create_batched_prompt(slack_messages, current_knowledge_base, guidelines)
+            self.logger.log_chatgpt_request(prompt, self.model, self.temperature or 0.0)
+
+            self.rate_limiter.acquire(estimate_tokens(prompt))
+            if self.is_reasoning_model:
+                response = self._do_call(
+                    model=self.model,
+                    messages=[
+                        {"role": "user", "content": f"You are a precise fact-based knowledge management system. Follow instructions exactly.\n\n{prompt}"}
+                    ],
+                    max_completion_tokens=4000
+                )
+            else:
+                response = self._do_call(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": "You are a precise fact-based knowledge management system. Follow instructions exactly."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=self.temperature,
+                    max_tokens=4000
+                )
+
+            response_content = response.choices[0].message.content
+            usage_data = {
+                "prompt_tokens": response.usage.prompt_tokens,
+                "completion_tokens": response.usage.completion_tokens,
+                "total_tokens": response.usage.total_tokens
+            }
+            self.logger.log_chatgpt_response(response_content, usage_data)
+
+            parsed = self._parse_many(response_content, len(slack_messages))
+            if parsed is not None:
+                return parsed
+
+            self.logger.warning("Falling back to per-message updates after batched parse failure")
+
+        except Exception as e:
+            self.logger.log_error_with_context(e, "Batched ChatGPT API call for knowledge base update", {
+                "batch_size": len(slack_messages)
+            })
+
+        # Fallback: one call per message (original behavior)
+        results = [
+            self.update_knowledge_base(message, current_knowledge_base, guidelines)
+            for message in slack_messages
+        ]
+        return results if any(results) else None
+
+    def _relevant_facts(
+        self,
+        slack_message: SlackMessage,
+        knowledge_base: KnowledgeBase,
+        k: int = RELEVANCE_TOP_K
+    ) -> List[Fact]:
+        """Select the facts most likely to be touched by a Slack message.
+
+        Lexical scoring: shared word and numeric-literal overlap between the
+        message and each fact description, plus any fact number explicitly
+        referenced ("fact #12"). Good enough to prune a large KB down to the
+        handful of candidate rows without an embedding round trip.
+        """
+        message_text = slack_message.content.lower()
+        message_words = set(self._WORD_RE.findall(message_text))
+        message_numbers = set(self._NUMBER_RE.findall(message_text))
+        referenced = {int(m) for m in self._FACT_REF_RE.findall(slack_message.content)}
+
+        scored = []
+        for fact in knowledge_base.facts:
+            description = fact.description.lower()
+            words = set(self._WORD_RE.findall(description))
+            score = len(message_words & words)
+            # Numeric literals (metrics, amounts) are strong relevance signals
+            score += 3 * len(message_numbers & set(self._NUMBER_RE.findall(description)))
+            if fact.number in referenced:
+                score += 100
+            scored.append((score, fact))
+
+        scored.sort(key=lambda pair: pair[0], reverse=True)
+        selected = [fact for score, fact in scored[:k] if score > 0 or fact.number in referenced]
+        # Keep original KB order so the reduced table reads naturally
+        selected_numbers = {fact.number for fact in selected}
+        return [fact for fact in knowledge_base.facts if fact.number in selected_numbers]
+
+    @staticmethod
+    def _merge_updated_facts(full_kb: KnowledgeBase, updated_kb: KnowledgeBase) -> KnowledgeBase:
+        """Splice rows returned for a reduced KB back into the full KB.
+
+        Updated numbers replace their originals in place; new numbers are
+        appended. Facts the model never saw pass through untouched.
+        """
+        updated_by_number = {fact.number: fact for fact in updated_kb.facts}
+        merged = [updated_by_number.pop(fact.number, fact) for fact in full_kb.facts]
+        merged.extend(sorted(updated_by_number.values(), key=lambda fact: fact.number))
+        return KnowledgeBase(title=full_kb.title, facts=merged)
+
+    @staticmethod
+    def _estimate_output_tokens(knowledge_base: KnowledgeBase) -> int:
+        """Completion budget sized to the KB instead of a flat 4000.
+
+        ~80 tokens is a safe upper bound per markdown table row, plus slack
+        for the title and a few new facts. A tight max_tokens reserves less
+        provider-side KV cache (faster scheduling) and spends less of the
+        shared TPM budget per call.
+        """
+        return min(4000, max(512, len(knowledge_base.facts) * 80 + 200))
+
+    def _backoff_delay(self, attempt: int, error: Exception) -> float:
+        """Exponential backoff with jitter; logs the retry decision."""
+        delay = min(30.0, 2.0 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+        self.logger.warning(
+            f"Transient OpenAI error ({type(error).__name__}), retrying in {delay:.1f}s "
+            f"(attempt {attempt}/{self.MAX_ATTEMPTS})"
+        )
+        return delay
+
+    def _do_call(self, **create_kwargs):
+        """Chat completion with retry on transient errors only.
+
+        A single 429/5xx/network blip used to wipe the whole update; retrying
+        with exponential backoff and jitter recovers those for free. Bad
+        requests and auth failures are re-raised immediately so prompt bugs
+        and config problems don't hide behind three pointless retries.
+        """
+        for attempt in range(1, self.MAX_ATTEMPTS + 1):
+            try:
+                return self.client.chat.completions.create(**create_kwargs)
+            except self.RETRYABLE_ERRORS as e:
+                if attempt == self.MAX_ATTEMPTS:
+                    raise
+                time.sleep(self._backoff_delay(attempt, e))
+
+    async def _ado_call(self, **create_kwargs):
+        """Async twin of _do_call - same retry policy, non-blocking sleeps."""
+        for attempt in range(1, self.MAX_ATTEMPTS + 1):
+            try:
+                return await self.aclient.chat.completions.create(**create_kwargs)
+            except self.RETRYABLE_ERRORS as e:
+                if attempt == self.MAX_ATTEMPTS:
+                    raise
+                await asyncio.sleep(self._backoff_delay(attempt, e))
+
+    def _stream_chat_completion(self, messages: list, **create_kwargs):
+        """Stream a chat completion, parsing fact rows while tokens arrive.
+
+        Overlaps network/decoding with parsing: each time a line completes in
+        the buffer it is matched against _ROW_RE, so the table is already
+        parsed by the time the model emits its final token.
+        Returns (content, facts, usage_data).
+        """
+        self.rate_limiter.acquire(estimate_tokens("".join(m["content"] for m in messages)))
+        stream = self._do_call(
+            messages=messages,
+            stream=True,
+            stream_options={"include_usage": True},
+            **create_kwargs
+        )
+
+        buffer = ""
+        scanned = 0  # offset up to which complete lines have been parsed
+        facts = []
+        usage_data = None
+
+        def parse_rows(end: int):
+            nonlocal scanned
+            for match in self._ROW_RE.finditer(buffer, scanned, end):
+                try:
+                    number = int(match[1])
+                except ValueError:
+                    continue
+                facts.append(Fact(number=number, description=match[2], last_validated=match[3]))
+            scanned = end
+
+        for chunk in stream:
+            if getattr(chunk, "usage", None):
+                usage_data = {
+                    "prompt_tokens": chunk.usage.prompt_tokens,
+                    "completion_tokens": chunk.usage.completion_tokens,
+                    "total_tokens": chunk.usage.total_tokens
+                }
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            buffer += delta
+            last_newline = buffer.rfind('\n')
+            if last_newline >= scanned:
+                parse_rows(last_newline + 1)
+
+        # Pick up a final row without a trailing newline
+        parse_rows(len(buffer))
+
+        return buffer, facts, usage_data
+
     def _parse_knowledge_base_response(self, response: str) -> KnowledgeBase:
         """Parse ChatGPT response back into a KnowledgeBase object."""
         self.logger.debug("Parsing ChatGPT response into knowledge base structure")
-        
-        lines = response.strip().split('\n')
+
+        title_match = self._TITLE_RE.search(response)
+        title = title_match.group(1).strip() if title_match else "Current RN Project Facts"
+
         facts = []
-        
-        # Find the title
-        title = "Current RN Project Facts"  # Default
-        for line in lines:
-            if line.startswith('#') and not line.startswith('##'):
-                title = line.strip('# ').strip()
-                break
-        
-        # Parse the table rows
-        in_table = False
-        for line in lines:
-            line = line.strip()
-            
-            # Skip header and separator rows
-            if line.startswith('| **#**') or line.startswith('| -----'):
-                in_table = True
+        for match in self._ROW_RE.finditer(response):
+            try:
+                number = int(match[1])
+            except ValueError as e:
+                self.logger.warning(f"Failed to parse table row: {match.group(0)}", {"error": str(e)})
                 continue
-                
-            # Parse fact rows
-            if in_table and line.startswith('| **') and line.endswith(' |'):
-                try:
-                    # Split by | and clean up
-                    parts = [part.strip() for part in line.split('|')[1:-1]]  # Remove empty first/last
-                    if len(parts) >= 3:
-                        # Extract fact number (remove ** formatting)
-                        number_str = parts[0].replace('**', '').strip()
-                        number = int(number_str)
-                        
-                        # Extract description and validation date
-                        description = parts[1].strip()
-                        last_validated = parts[2].strip()
-                        
-                        fact = Fact(
-                            number=number,
-                            description=description,
-                            last_validated=last_validated
-                        )
-                        facts.append(fact)
-                        
-                        self.logger.debug(f"Parsed fact #{number}: {description[:50]}...")
-                        
-                except (ValueError, IndexError) as e:
-                    self.logger.warning(f"Failed to parse table row: {line}", {"error": str(e)})
-                    continue
-        
+
+            facts.append(Fact(
+                number=number,
+                description=match[2],
+                last_validated=match[3]
+            ))
+
+            self.logger.debug(f"Parsed fact #{number}: {match[2][:50]}...")
+
         self.logger.info(f"Successfully parsed {len(facts)} facts from ChatGPT response")
-        
+
         return KnowledgeBase(title=title, facts=facts)
     
     def update_knowledge_base(
@@ -133,90 +465,206 @@ Do not include any explanation, analysis, or additional text. Only return the up
         """
         try:
             self.logger.info("Starting knowledge base update process")
-            
-            # Create the prompt
-            prompt = self._create_knowledge_update_prompt(slack_message, current_knowledge_base, guidelines)
-            
+
+            # Check the semantic cache before paying for an LLM round trip
+            kb_hash = knowledge_base_hash(current_knowledge_base)
+            cached = self.update_cache.get(slack_message.content, kb_hash)
+            if cached is not None:
+                return cached
+
+            # On large KBs, prompt with only the relevant facts and splice the
+            # reply back locally - output tokens are the slow, expensive part
+            prompt_kb = current_knowledge_base
+            if len(current_knowledge_base.facts) > self.RELEVANCE_KB_THRESHOLD:
+                relevant = self._relevant_facts(slack_message, current_knowledge_base)
+                if relevant:
+                    prompt_kb = KnowledgeBase(title=current_knowledge_base.title, facts=relevant)
+                    self.logger.info(
+                        f"Reduced KB prompt to {len(relevant)} of {len(current_knowledge_base.facts)} facts"
+                    )
+
+            # Create the prompts: stable system message, volatile user message
+            system_prompt = self._knowledge_update_system_prompt(guidelines)
+            prompt = self._create_knowledge_update_prompt(slack_message, prompt_kb, guidelines)
+
             # Log the request
             self.logger.log_chatgpt_request(prompt, self.model, self.temperature or 0.0)
-            
+
+            output_budget = self._estimate_output_tokens(prompt_kb)
+
             # Make the API call
+            # Note: o1 and o3 models don't support system messages, temperature
+            # or streaming with reasoning, so they keep the blocking call
+            if self.is_reasoning_model:
+                self.rate_limiter.acquire(estimate_tokens(system_prompt + prompt, output_budget))
+                response = self._do_call(
+                    model=self.model,
+                    messages=[
+                        {"role": "user", "content": f"{system_prompt}\n\n{prompt}"}
+                    ],
+                    max_completion_tokens=output_budget
+                )
+
+                response_content = response.choices[0].message.content
+                usage_data = {
+                    "prompt_tokens": response.usage.prompt_tokens,
+                    "completion_tokens": response.usage.completion_tokens,
+                    "total_tokens": response.usage.total_tokens
+                }
+                self.logger.log_chatgpt_response(response_content, usage_data)
+
+                updated_knowledge_base = self._parse_knowledge_base_response(response_content)
+            else:
+                # Stream the completion and parse table rows as they arrive,
+                # so parsing finishes with the last token instead of after it
+                response_content, facts, usage_data = self._stream_chat_completion(
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": prompt}
+                    ],
+                    model=self.model,
+                    temperature=self.temperature,
+                    max_tokens=output_budget
+                )
+                self.logger.log_chatgpt_response(response_content, usage_data)
+
+                title_match = self._TITLE_RE.search(response_content)
+                title = title_match.group(1).strip() if title_match else "Current RN Project Facts"
+                updated_knowledge_base = KnowledgeBase(title=title, facts=facts)
+
+            if usage_data:
+                # Tuning signal for the 80 tokens/row constant in _estimate_output_tokens
+                self.logger.debug(
+                    f"Output budget {output_budget} vs actual completion tokens {usage_data['completion_tokens']}"
+                )
+
+            if prompt_kb is not current_knowledge_base:
+                updated_knowledge_base = self._merge_updated_facts(current_knowledge_base, updated_knowledge_base)
+
+            self.logger.info(f"Successfully updated knowledge base with {len(updated_knowledge_base.facts)} facts")
+
+            # Store so similar future messages against this KB state are free
+            self.update_cache.put(slack_message.content, kb_hash, updated_knowledge_base)
+
+            return updated_knowledge_base
+
+        except Exception as e:
+            self.logger.log_error_with_context(e, "ChatGPT API call for knowledge base update", {
+                "slack_message_content": slack_message.content[:100] + "..." if len(slack_message.content) > 100 else slack_message.content,
+                "current_facts_count": len(current_knowledge_base.facts)
+            })
+            return None
+    
+    async def aupdate_knowledge_base(
+        self,
+        slack_message: SlackMessage,
+        current_knowledge_base: KnowledgeBase,
+        guidelines: str
+    ) -> Optional[KnowledgeBase]:
+        """
+        Async variant of update_knowledge_base.
+        Awaits the shared AsyncOpenAI client so callers can overlap many updates.
+        Returns None if an error occurs.
+        """
+        try:
+            self.logger.info("Starting async knowledge base update process")
+
+            system_prompt = self._knowledge_update_system_prompt(guidelines)
+            prompt = self._create_knowledge_update_prompt(slack_message, current_knowledge_base, guidelines)
+            self.logger.log_chatgpt_request(prompt, self.model, self.temperature or 0.0)
+
+            output_budget = self._estimate_output_tokens(current_knowledge_base)
+            await self.rate_limiter.aacquire(estimate_tokens(system_prompt + prompt, output_budget))
+
             # Note: o1 and o3 models don't support system messages or temperature
-            if self.model.startswith("o1") or self.model.startswith("o3"):
-                response = self.client.chat.completions.create(
+            if self.is_reasoning_model:
+                response = await self._ado_call(
                     model=self.model,
                     messages=[
-                        {"role": "user", "content": f"You are a precise fact-based knowledge management system. Follow instructions exactly.\n\n{prompt}"}
+                        {"role": "user", "content": f"{system_prompt}\n\n{prompt}"}
                     ],
-                    max_completion_tokens=4000
+                    max_completion_tokens=output_budget
                 )
             else:
-                response = self.client.chat.completions.create(
+                response = await self._ado_call(
                     model=self.model,
                     messages=[
-                        {"role": "system", "content": "You are a precise fact-based knowledge management system. Follow instructions exactly."},
+                        {"role": "system", "content": system_prompt},
                         {"role": "user", "content": prompt}
                     ],
                     temperature=self.temperature,
-                    max_tokens=4000
+                    max_tokens=output_budget
                 )
-            
-            # Extract response content and usage data
+
             response_content = response.choices[0].message.content
             usage_data = {
                 "prompt_tokens": response.usage.prompt_tokens,
                 "completion_tokens": response.usage.completion_tokens,
                 "total_tokens": response.usage.total_tokens
             }
-            
-            # Log the response
+
             self.logger.log_chatgpt_response(response_content, usage_data)
-            
-            # Parse the response into a knowledge base
+
             updated_knowledge_base = self._parse_knowledge_base_response(response_content)
-            
+
             self.logger.info(f"Successfully updated knowledge base with {len(updated_knowledge_base.facts)} facts")
-            
+
             return updated_knowledge_base
-            
+
         except Exception as e:
-            self.logger.log_error_with_context(e, "ChatGPT API call for knowledge base update", {
+            self.logger.log_error_with_context(e, "Async ChatGPT API call for knowledge base update", {
                 "slack_message_content": slack_message.content[:100] + "..." if len(slack_message.content) > 100 else slack_message.content,
                 "current_facts_count": len(current_knowledge_base.facts)
             })
             return None
-    
+
+    async def update_many(
+        self,
+        slack_messages: List[SlackMessage],
+        current_knowledge_base: KnowledgeBase,
+        guidelines: str,
+        concurrency: int = 32
+    ) -> List[Optional[KnowledgeBase]]:
+        """
+        Process many Slack messages concurrently against the same knowledge base.
+        Concurrency is bounded by a semaphore so bursts don't trip rate limits.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded(message: SlackMessage) -> Optional[KnowledgeBase]:
+            async with semaphore:
+                return await self.aupdate_knowledge_base(message, current_knowledge_base, guidelines)
+
+        return await asyncio.gather(*(bounded(message) for message in slack_messages))
+
+    def update_many_sync(
+        self,
+        slack_messages: List[SlackMessage],
+        current_knowledge_base: KnowledgeBase,
+        guidelines: str,
+        concurrency: int = 32
+    ) -> List[Optional[KnowledgeBase]]:
+        """Sync shim over update_many for callers without an event loop."""
+        return asyncio.run(self.update_many(slack_messages, current_knowledge_base, guidelines, concurrency))
+
     def test_connection(self) -> bool:
-        """Test if ChatGPT API connection is working."""
+        """Test if ChatGPT API connection is working.
+
+        Uses models.retrieve - a single GET with zero billed tokens - rather
+        than a full chat completion. It still proves the key is valid and the
+        configured model is reachable, which is all the health check needs.
+        """
         try:
             self.logger.info("Testing ChatGPT API connection")
-            
-            # Simple test message for connection
-            test_content = "Hello, please respond with 'Connection successful'"
-            
-            if self.model.startswith("o1") or self.model.startswith("o3"):
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[{"role": "user", "content": test_content}],
-                    max_completion_tokens=50  # o1 models need more tokens for reasoning
-                )
-            else:
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[{"role": "user", "content": test_content}],
-                    max_tokens=10
-                )
-            
-            response_content = response.choices[0].message.content
-            success = "Connection successful" in response_content or "successful" in response_content.lower()
-            
-            if success:
-                self.logger.info("ChatGPT API connection test successful")
-            else:
-                self.logger.warning("ChatGPT API connection test returned unexpected response", {"response": response_content})
-                
-            return success
-            
+
+            self.client.models.retrieve(self.model)
+
+            self.logger.info("ChatGPT API connection test successful")
+            return True
+
+        except AuthenticationError as e:
+            self.logger.log_error_with_context(e, "ChatGPT API connection test (invalid API key)")
+            return False
         except Exception as e:
             self.logger.log_error_with_context(e, "ChatGPT API connection test")
             return False 
\ No newline at end of file
@@ -3,72 +3,186 @@ Hardcoded data for the initial testing phase.
 This will be replaced with live API integrations later.
 """
 from src.models import Fact, KnowledgeBase, SlackMessage
-from src.supabase_service import SupabaseService
+from src.supabase_service import supabase_service
 import csv
+import functools
+import io
+import pickle
+import threading
+import time
 from pathlib import Path
 
-
-def get_sample_slack_message() -> SlackMessage:
-    """Returns a hardcoded sample Slack message with project metrics."""
-    content = """Here's this week's Atlas update:
+# TTL cache with stale-while-revalidate for the remote KB/guidelines: within
+# the TTL a call is a dict lookup; past it, callers are served the stale value
+# immediately while a daemon thread refreshes in the background. Only a cold
+# process ever blocks on Supabase.
+_CACHE_TTL_SECONDS = 60.0
+_CACHE = {}
+_CACHE_LOCK = threading.Lock()
+_REFRESHING = set()
+
+
+def _cached(key, loader, ttl=_CACHE_TTL_SECONDS):
+    """Return the cached value for key, refreshing via loader as needed."""
+    now = time.monotonic()
+    with _CACHE_LOCK:
+        entry = _CACHE.get(key)
+        if entry is not None and now - entry[0] < ttl:
+            return entry[1]
+        start_refresh = key not in _REFRESHING
+        if start_refresh:
+            _REFRESHING.add(key)
+
+    if entry is None:
+        # Cold cache - nothing to serve stale, so load synchronously
+        try:
+            value = loader()
+        except BaseException:
+            with _CACHE_LOCK:
+                _REFRESHING.discard(key)
+            raise
+        with _CACHE_LOCK:
+            _CACHE[key] = (time.monotonic(), value)
+            _REFRESHING.discard(key)
+        return value
+
+    if start_refresh:
+        def _refresh():
+            try:
+                value = loader()
+                with _CACHE_LOCK:
+                    _CACHE[key] = (time.monotonic(), value)
+            finally:
+                with _CACHE_LOCK:
+                    _REFRESHING.discard(key)
+
+        threading.Thread(target=_refresh, daemon=True).start()
+
+    return entry[1]
+
+
+# Frozen at import time - these fire on every request in fallback mode, so
+# rebuilding them per call is pure allocation/GC overhead.
+_SAMPLE_SLACK_MESSAGE = SlackMessage(
+    content="""Here's this week's Atlas update:
 - 11,156 offers live (last: 11,287)  
 - Restaurant coverage: 62.0% (last: 62.7%)
 - Card capture rate: 53.8% (last: 54.1%)
 - ARR: $8.7M (last: $8.5M)
 
-Additional context: The slight decrease in offers is due to some restaurants temporarily opting out during the holiday season. We expect this to recover in the new year. The ARR increase is strong despite the slight dip in other metrics."""
-    
-    return SlackMessage(
-        content=content,
-        channel="#atlas-updates",
-        user="project-manager"
-    )
+Additional context: The slight decrease in offers is due to some restaurants temporarily opting out during the holiday season. We expect this to recover in the new year. The ARR increase is strong despite the slight dip in other metrics.""",
+    channel="#atlas-updates",
+    user="project-manager"
+)
 
+_MISSING_KB_FACTS = (
+    Fact(number=1, description="Fallback KB not available", last_validated="1970-01-01"),
+)
 
-CSV_FALLBACK_PATH = Path(__file__).resolve().parent / "full-hardcoded-facts.csv"
 
+def get_sample_slack_message() -> SlackMessage:
+    """Returns a hardcoded sample Slack message with project metrics."""
+    # Shallow copy so callers mutating the message can't poison the constant
+    return _SAMPLE_SLACK_MESSAGE.model_copy()
 
-def _local_facts():
-    """Load fallback facts from `full-facts-temp.csv` so it stays in sync with Supabase."""
-    if CSV_FALLBACK_PATH.exists():
+
+CSV_FALLBACK_PATH = Path(__file__).resolve().parent / "full-hardcoded-facts.csv"
+
+# Disk memo of the parsed CSV; unpickling is one C call vs text parsing +
+# model construction. Best-effort only - deploy filesystems may be read-only.
+PKL_FALLBACK_PATH = CSV_FALLBACK_PATH.with_suffix(".pkl")
+
+
+# Accepted header spellings for each CSV column
+_CSV_COLUMNS = {
+    "number": ("#", "number"),
+    "description": ("Fact", "description"),
+    "last_validated": ("Time Last Validated", "last_validated"),
+}
+
+
+def _column_index(header, names):
+    for name in names:
+        if name in header:
+            return header.index(name)
+    return -1
+
+
+@functools.lru_cache(maxsize=1)
+def _read_csv_text(mtime_ns: int) -> str:
+    """Read the fallback CSV once per mtime; empty string when unreadable."""
+    try:
+        return CSV_FALLBACK_PATH.read_text(encoding="utf-8")
+    except OSError:
+        return ""
+
+
+@functools.lru_cache(maxsize=4)
+def _local_facts_cached(mtime_ns: int):
+    """Parse the fallback CSV, memoized per file mtime.
+
+    A changed file gets a new mtime key and re-parses; otherwise repeat
+    fallbacks (health checks, error paths) are a cache hit with no disk I/O.
+    """
+    try:
+        if PKL_FALLBACK_PATH.stat().st_mtime_ns >= mtime_ns:
+            cached = pickle.loads(PKL_FALLBACK_PATH.read_bytes())
+            if cached:
+                return tuple(cached)
+    except Exception:
+        pass  # missing/stale/corrupt pickle - fall through to the CSV parse
+
+    # One buffered read + decode, then parse from memory - cheaper than
+    # letting the csv module pull the file line by line
+    text = _read_csv_text(mtime_ns)
+    if text:
         facts = []
-        with open(CSV_FALLBACK_PATH, newline="", encoding="utf-8") as fp:
-            reader = csv.DictReader(fp)
-            header_map = {
-                "#": "number",
-                "number": "number",
-                "Fact": "description",
-                "description": "description",
-                "Time Last Validated": "last_validated",
-                "last_validated": "last_validated",
-            }
-            for raw in reader:
-                row = {header_map.get(k, k): v for k, v in raw.items()}
+        reader = csv.reader(io.StringIO(text, newline=""))
+        header = next(reader, [])
+        # Resolve column positions once instead of remapping a dict per row
+        i_num = _column_index(header, _CSV_COLUMNS["number"])
+        i_desc = _column_index(header, _CSV_COLUMNS["description"])
+        i_val = _column_index(header, _CSV_COLUMNS["last_validated"])
+        if min(i_num, i_desc, i_val) >= 0:
+            width = max(i_num, i_desc, i_val)
+            for row in reader:
+                if len(row) <= width:
+                    continue
                 try:
-                    num = int(row["number"].strip())
-                except Exception:
+                    num = int(row[i_num].strip())
+                except ValueError:
                     continue
+                # model_construct skips validation - the bundled CSV is trusted
                 facts.append(
-                    Fact(
+                    Fact.model_construct(
                         number=num,
-                        description=row["description"].strip(),
-                        last_validated=row["last_validated"].strip(),
+                        description=row[i_desc].strip(),
+                        last_validated=row[i_val].strip(),
                     )
                 )
         if facts:
+            facts = tuple(facts)
+            try:
+                PKL_FALLBACK_PATH.write_bytes(pickle.dumps(facts))
+            except OSError:
+                pass  # read-only filesystem (e.g. deployed bundle)
             return facts
     # minimal fallback if CSV missing
-    return [
-        Fact(number=1, description="Fallback KB not available", last_validated="1970-01-01")
-    ]
+    return _MISSING_KB_FACTS
 
 
-def get_current_knowledge_base() -> KnowledgeBase:
-    """Fetch knowledge base from Supabase; fall back to local hardcoded copy."""
-    from src.supabase_service import SupabaseService  # inline import
+def _local_facts():
+    """Return a fresh list of fallback facts (cached parse keyed on mtime)."""
+    try:
+        mtime_ns = CSV_FALLBACK_PATH.stat().st_mtime_ns
+    except OSError:
+        return list(_MISSING_KB_FACTS)
+    return list(_local_facts_cached(mtime_ns))
 
-    sb = SupabaseService()
-    kb = sb.fetch_knowledge_base()
+
+def _load_knowledge_base() -> KnowledgeBase:
+    """Fetch knowledge base from Supabase; fall back to local hardcoded copy."""
+    kb = supabase_service.fetch_knowledge_base()
     if kb:
         return kb
 
@@ -76,9 +190,25 @@ def get_current_knowledge_base() -> KnowledgeBase:
     return KnowledgeBase(title="Current RN Project Facts", facts=_local_facts())
 
 
-def _local_guidelines() -> str:
-    """Local fallback copy of the knowledge management guidelines."""
-    return """# Knowledge Management Guidelines
+def get_current_knowledge_base() -> KnowledgeBase:
+    """Return the (cached) current knowledge base."""
+    return _cached("kb", _load_knowledge_base)
+
+
+def invalidate_knowledge_base_cache() -> None:
+    """Drop the cached KB so the next read refetches.
+
+    Called by the Supabase write paths: without it, read-after-write flows
+    (the task loop, queued Slack messages) would keep prompting against the
+    pre-write KB for up to the TTL and then overwrite the newer rows.
+    """
+    with _CACHE_LOCK:
+        _CACHE.pop("kb", None)
+
+
+# Guidelines are immutable text - one module-level string, shared by every
+# caller, instead of re-evaluating a 4KB literal inside a function call.
+_LOCAL_GUIDELINES = """# Knowledge Management Guidelines
 
 ## About This Knowledge Base
 This is a fact-based knowledge management system for tracking project information. Each fact has a number, description, and validation date. The goal is maintaining accurate, current, and useful information that serves as a reliable source for answering operational questions.
@@ -167,10 +297,43 @@ When uncertain about fact management decisions:
 5. Completeness Test: Can this fact be understood without requiring other facts for context?"""
 
 
-def get_knowledge_guidelines() -> str:
+def _local_guidelines() -> str:
+    """Local fallback copy of the knowledge management guidelines."""
+    return _LOCAL_GUIDELINES
+
+
+def _load_guidelines() -> str:
     """Fetch guidelines from Supabase; fall back to local copy on failure."""
-    sb = SupabaseService()
-    supabase_copy = sb.fetch_guidelines()
+    supabase_copy = supabase_service.fetch_guidelines()
     if supabase_copy:
         return supabase_copy
-    return _local_guidelines() 
\ No newline at end of file
+    return _local_guidelines()
+
+
+def get_knowledge_guidelines() -> str:
+    """Return the (cached) knowledge management guidelines."""
+    return _cached("guidelines", _load_guidelines)
+
+
+def get_bootstrap_data():
+    """Return (knowledge base, guidelines), fetched together when cold.
+
+    When both values are already cached this is two dict lookups; on a cold
+    cache the two Supabase fetches run concurrently via fetch_bootstrap so
+    startup pays roughly one round trip instead of two sequential ones.
+    """
+    with _CACHE_LOCK:
+        cold = "kb" not in _CACHE or "guidelines" not in _CACHE
+
+    if cold:
+        kb, guidelines = supabase_service.fetch_bootstrap()
+        if kb is None:
+            kb = KnowledgeBase(title="Current RN Project Facts", facts=_local_facts())
+        if guidelines is None:
+            guidelines = _local_guidelines()
+        ts = time.monotonic()
+        with _CACHE_LOCK:
+            _CACHE.setdefault("kb", (ts, kb))
+            _CACHE.setdefault("guidelines", (ts, guidelines))
+
+    return get_current_knowledge_base(), get_knowledge_guidelines() 
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""
+Semantic response cache for knowledge base updates.
+
+Near-identical Slack messages (e.g. the same weekly metrics update restated)
+used to trigger a full gpt-4o round trip every time. This cache embeds each
+message once, stores the parsed result in a local sqlite database, and serves
+repeat messages from a vector similarity lookup instead of the API. The
+current knowledge base markdown is hashed into the key so a stale KB state
+never leaks into a hit.
+"""
+import hashlib
+import json
+import math
+import os
+import sqlite3
+from typing import List, Optional
+
+from src.models import KnowledgeBase
+
+# /tmp is the only writable path on Vercel; the cache is best-effort anyway
+DEFAULT_CACHE_PATH = os.getenv("KB_CACHE_PATH", "/tmp/kb_update_cache.sqlite3")
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+
+def knowledge_base_hash(knowledge_base: KnowledgeBase) -> str:
+    """Short content hash of a knowledge base, used as a strict cache side-key."""
+    return hashlib.sha256(knowledge_base.to_markdown().encode("utf-8")).hexdigest()[:16]
+
+
+class KBUpdateCache:
+    """Embedding-similarity cache mapping (slack message, KB state) -> parsed KB."""
+
+    def __init__(self, client, logger, path: str = DEFAULT_CACHE_PATH, threshold: float = 0.92):
+        self.client = client  # OpenAI client used for embeddings
+        self.logger = logger
+        self.threshold = threshold
+        # Embeddings computed during get() are reused by the following put()
+        self._pending_embeddings = {}
+        try:
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS kb_updates ("
+                "kb_hash TEXT NOT NULL, "
+                "embedding TEXT NOT NULL, "
+                "result TEXT NOT NULL)"
+            )
+            self.conn.commit()
+        except Exception:
+            # Cache is an optimization only - run without it on any failure
+            self.conn = None
+
+    def _embed(self, text: str) -> List[float]:
+        response = self.client.embeddings.create(model=EMBEDDING_MODEL, input=text[:8000])
+        return response.data[0].embedding
+
+    @staticmethod
+    def _cosine_similarity(a: List[float], b: List[float]) -> float:
+        dot = sum(x * y for x, y in zip(a, b))
+        norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+        return dot / norm if norm else 0.0
+
+    def get(self, message_content: str, kb_hash: str, threshold: Optional[float] = None) -> Optional[KnowledgeBase]:
+        """Return the cached parsed KB for a similar message, or None on miss."""
+        if self.conn is None:
+            return None
+        try:
+            rows = self.conn.execute(
+                "SELECT embedding, result FROM kb_updates WHERE kb_hash = ?", (kb_hash,)
+            ).fetchall()
+
+            embedding = self._embed(message_content)
+            # Remember the embedding so a following put() doesn't re-embed
+            self._pending_embeddings[(hash(message_content), kb_hash)] = embedding
+
+            if not rows:
+                return None
+
+            min_similarity = threshold if threshold is not None else self.threshold
+            best_score, best_result = 0.0, None
+            for stored_embedding, stored_result in rows:
+                score = self._cosine_similarity(embedding, json.loads(stored_embedding))
+                if score > best_score:
+                    best_score, best_result = score, stored_result
+
+            if best_result is not None and best_score >= min_similarity:
+                self.logger.info(f"Semantic cache hit for knowledge base update (similarity={best_score:.3f})")
+                return KnowledgeBase.model_validate_json(best_result)
+
+            return None
+        except Exception:
+            return None
+
+    def put(self, message_content: str, kb_hash: str, parsed_kb: KnowledgeBase):
+        """Store a parsed result keyed by the message embedding and KB hash."""
+        if self.conn is None:
+            return
+        try:
+            embedding = self._pending_embeddings.pop((hash(message_content), kb_hash), None)
+            if embedding is None:
+                embedding = self._embed(message_content)
+            self.conn.execute(
+                "INSERT INTO kb_updates (kb_hash, embedding, result) VALUES (?, ?, ?)",
+                (kb_hash, json.dumps(embedding), parsed_kb.model_dump_json())
+            )
+            self.conn.commit()
+        except Exception:
+            pass
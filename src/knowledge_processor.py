@@ -2,13 +2,21 @@
 Main knowledge processing service that orchestrates the entire flow.
 """
 import os
+import time
 from typing import Optional
 from src.models import ProcessingRequest, ProcessingResponse, SlackMessage, KnowledgeBase
 from src.chatgpt_service import ChatGPTService
 from src.logger import KnowledgeLogger, LogLevel
-from src.hardcoded_data import get_sample_slack_message, get_current_knowledge_base, get_knowledge_guidelines
+from src.hardcoded_data import get_sample_slack_message, get_current_knowledge_base, get_knowledge_guidelines, get_bootstrap_data
 from src.supabase_service import SupabaseService
 
+# Environment variables the system cannot run without
+REQUIRED_ENV_VARS = ("OPENAI_API_KEY",)
+
+# How long a health-check result stays valid; keeps load-balancer probes from
+# issuing a paid OpenAI call every few seconds
+HEALTH_CACHE_TTL_SECONDS = 10.0
+
 
 class KnowledgeProcessor:
     """Main service for processing knowledge base updates."""
@@ -23,6 +31,9 @@ class KnowledgeProcessor:
         
         # Initialize ChatGPT service
         self.chatgpt_service = ChatGPTService(self.logger)
+
+        # (monotonic timestamp, health dict) of the last health check
+        self._health_cache = None
         
         self.logger.info("Knowledge processor initialized", {
             "environment": environment,
@@ -35,13 +46,14 @@ class KnowledgeProcessor:
         This uses hardcoded data instead of live APIs.
         """
         self.logger.info("Starting hardcoded knowledge processing flow")
-        
+
+        current_knowledge_base = None
         try:
             # Step 1: Get hardcoded data
             self.logger.info("Loading hardcoded data")
             slack_message = get_sample_slack_message()
-            current_knowledge_base = get_current_knowledge_base()
-            guidelines = get_knowledge_guidelines()
+            # One bundled (and cached) fetch instead of two sequential ones
+            current_knowledge_base, guidelines = get_bootstrap_data()
             
             self.logger.info("Hardcoded data loaded successfully", {
                 "slack_message_length": len(slack_message.content),
@@ -88,8 +100,12 @@ class KnowledgeProcessor:
             
         except Exception as e:
             self.logger.log_error_with_context(e, "Hardcoded knowledge processing flow")
+            # Reuse the KB we already loaded; only refetch if the failure
+            # happened before the load
+            if current_knowledge_base is None:
+                current_knowledge_base = get_current_knowledge_base()
             return ProcessingResponse(
-                updated_knowledge_base=get_current_knowledge_base(),  # Return original as fallback
+                updated_knowledge_base=current_knowledge_base,  # Return original as fallback
                 processing_log=self.logger.get_processing_summary(),
                 success=False,
                 error_message=f"Processing failed: {str(e)}"
@@ -145,13 +161,18 @@ class KnowledgeProcessor:
             )
     
     def test_system_health(self) -> dict:
-        """Test all system components and return health status."""
+        """Test all system components and return health status (cached 10s)."""
+        if self._health_cache is not None:
+            age = time.monotonic() - self._health_cache[0]
+            if age < HEALTH_CACHE_TTL_SECONDS:
+                return self._health_cache[1]
+
         self.logger.info("Testing system health")
         
         health_status = {
             "overall_status": "healthy",
             "components": {},
-            "timestamp": self.logger._create_log_entry(LogLevel.INFO, "Health check")["timestamp"]
+            "timestamp": self.logger._create_log_entry(LogLevel.INFO, "Health check").timestamp
         }
         
         # Test ChatGPT API connection
@@ -169,12 +190,7 @@ class KnowledgeProcessor:
             health_status["overall_status"] = "degraded"
         
         # Test environment variables
-        required_env_vars = ["OPENAI_API_KEY"]
-        missing_vars = []
-        
-        for var in required_env_vars:
-            if not os.getenv(var):
-                missing_vars.append(var)
+        missing_vars = [var for var in REQUIRED_ENV_VARS if not os.getenv(var)]
         
         if missing_vars:
             health_status["components"]["environment"] = {
@@ -206,5 +222,6 @@ class KnowledgeProcessor:
             health_status["overall_status"] = "degraded"
         
         self.logger.info("System health check completed", {"status": health_status["overall_status"]})
-        
+
+        self._health_cache = (time.monotonic(), health_status)
         return health_status 
\ No newline at end of file
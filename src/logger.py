@@ -1,12 +1,14 @@
 """
 Comprehensive logging system for knowledge management processing.
 """
-import json
-import os
-from datetime import datetime
-from typing import Any, Dict, Optional
+import sys
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
 from enum import Enum
 
+import orjson
+
 
 class LogLevel(Enum):
     DEBUG = "DEBUG"
@@ -15,59 +17,122 @@ class LogLevel(Enum):
     ERROR = "ERROR"
 
 
+@dataclass(slots=True)
+class LogEntry:
+    """One recorded log line; slots halve the per-entry memory of a dict."""
+    timestamp: str
+    level: str
+    message: str
+    environment: str
+    data: Optional[Dict[str, Any]] = None
+
+
+# Numeric severity for level gating
+_LEVEL_ORDER = {
+    LogLevel.DEBUG: 10,
+    LogLevel.INFO: 20,
+    LogLevel.WARNING: 30,
+    LogLevel.ERROR: 40,
+}
+
+
 class KnowledgeLogger:
     """Logger specifically designed for knowledge management operations."""
     
     def __init__(self, environment: str = "development"):
         self.environment = environment
         self.logs = []
+        is_development = environment == "development"
+        # Production skips debug entries entirely and keeps no history -
+        # accumulating multi-KB prompt payloads per request is pure overhead
+        self._min_level = LogLevel.DEBUG if is_development else LogLevel.INFO
+        self._keep_history = is_development
+        self._pretty_data = is_development
+
+    def _is_enabled(self, level: LogLevel) -> bool:
+        return _LEVEL_ORDER[level] >= _LEVEL_ORDER[self._min_level]
+
+    def _dump_data(self, extra_data: Dict[str, Any]) -> str:
+        # orjson is several times faster than stdlib json; pretty-printing
+        # (~3x slower) is reserved for local development output
+        option = orjson.OPT_INDENT_2 if self._pretty_data else 0
+        return orjson.dumps(extra_data, option=option, default=str).decode()
+
+    def _emit(self, level: LogLevel, message: str, extra_data: Optional[Dict[str, Any]] = None):
+        """Write one log line (plus optional data) with a single stdout write.
+
+        print() takes the stdout lock and flushes per call; emitting the
+        whole record at once halves the syscall/lock traffic for entries
+        that carry data.
+        """
+        if extra_data:
+            sys.stdout.write(f"[{level.value}] {message}\n  Data: {self._dump_data(extra_data)}\n")
+        else:
+            sys.stdout.write(f"[{level.value}] {message}\n")
         
-    def _create_log_entry(self, level: LogLevel, message: str, extra_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def _create_log_entry(self, level: LogLevel, message: str, extra_data: Optional[Dict[str, Any]] = None) -> LogEntry:
         """Create a standardized log entry."""
-        entry = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "level": level.value,
-            "message": message,
-            "environment": self.environment
-        }
-        
-        if extra_data:
-            entry["data"] = extra_data
-            
-        return entry
+        return LogEntry(
+            # timespec="milliseconds" skips microsecond formatting; utcnow is
+            # also deprecated in favor of the tz-aware call
+            timestamp=datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            level=level.value,
+            message=message,
+            environment=self.environment,
+            data=extra_data or None,
+        )
     
-    def debug(self, message: str, extra_data: Optional[Dict[str, Any]] = None):
-        """Log debug information."""
+    def debug(self, message: str, extra_data: Optional[Dict[str, Any]] = None, *,
+              build: Optional[Callable[[], Dict[str, Any]]] = None):
+        """Log debug information.
+
+        `build` is a deferred payload factory, only invoked once the level
+        check passes - callers with expensive payloads pay nothing when
+        debug is off (same idea as logging's %s-style lazy formatting).
+        """
+        if not self._is_enabled(LogLevel.DEBUG):
+            return
+        if extra_data is None and build is not None:
+            extra_data = build()
         entry = self._create_log_entry(LogLevel.DEBUG, message, extra_data)
-        self.logs.append(entry)
-        if self.environment == "development":
-            print(f"[DEBUG] {message}")
-            if extra_data:
-                print(f"  Data: {json.dumps(extra_data, indent=2)}")
+        if self._keep_history:
+            self.logs.append(entry)
+        self._emit(LogLevel.DEBUG, message, extra_data)
     
-    def info(self, message: str, extra_data: Optional[Dict[str, Any]] = None):
-        """Log general information."""
+    def info(self, message: str, extra_data: Optional[Dict[str, Any]] = None, *,
+             build: Optional[Callable[[], Dict[str, Any]]] = None):
+        """Log general information.
+
+        Info-level data is only ever used for dev pretty-printing and dev
+        history, so a deferred `build` payload is skipped entirely in
+        production - the caller pays no dict construction at all.
+        """
+        if extra_data is None and build is not None and (self._keep_history or self._pretty_data):
+            extra_data = build()
         entry = self._create_log_entry(LogLevel.INFO, message, extra_data)
-        self.logs.append(entry)
-        print(f"[INFO] {message}")
-        if extra_data and self.environment == "development":
-            print(f"  Data: {json.dumps(extra_data, indent=2)}")
+        if self._keep_history:
+            self.logs.append(entry)
+        self._emit(LogLevel.INFO, message, extra_data if self._pretty_data else None)
     
-    def warning(self, message: str, extra_data: Optional[Dict[str, Any]] = None):
+    def warning(self, message: str, extra_data: Optional[Dict[str, Any]] = None, *,
+             build: Optional[Callable[[], Dict[str, Any]]] = None):
         """Log warning information."""
+        if extra_data is None and build is not None:
+            extra_data = build()
         entry = self._create_log_entry(LogLevel.WARNING, message, extra_data)
-        self.logs.append(entry)
-        print(f"[WARNING] {message}")
-        if extra_data:
-            print(f"  Data: {json.dumps(extra_data, indent=2)}")
+        if self._keep_history:
+            self.logs.append(entry)
+        self._emit(LogLevel.WARNING, message, extra_data)
     
-    def error(self, message: str, extra_data: Optional[Dict[str, Any]] = None):
+    def error(self, message: str, extra_data: Optional[Dict[str, Any]] = None, *,
+             build: Optional[Callable[[], Dict[str, Any]]] = None):
         """Log error information."""
+        if extra_data is None and build is not None:
+            extra_data = build()
         entry = self._create_log_entry(LogLevel.ERROR, message, extra_data)
-        self.logs.append(entry)
-        print(f"[ERROR] {message}")
-        if extra_data:
-            print(f"  Data: {json.dumps(extra_data, indent=2)}")
+        if self._keep_history:
+            self.logs.append(entry)
+        self._emit(LogLevel.ERROR, message, extra_data)
     
     def log_chatgpt_request(self, prompt: str, model: str, temperature: float = 0.1):
         """Log ChatGPT API request details."""
@@ -75,22 +140,22 @@ class KnowledgeLogger:
             "model": model,
             "temperature": temperature,
             "prompt_length": len(prompt),
-            "prompt_preview": prompt[:200] + "..." if len(prompt) > 200 else prompt
+            "prompt_preview": f"{prompt[:200]}..." if len(prompt) > 200 else prompt
         })
-        
-        # Also log full prompt in debug mode
-        self.debug("Full ChatGPT prompt", {"full_prompt": prompt})
-    
+
+        # Deferred payload: a 50KB prompt is only copied into a dict when
+        # debug is actually active
+        self.debug("Full ChatGPT prompt", build=lambda: {"full_prompt": prompt})
+
     def log_chatgpt_response(self, response: str, usage_data: Optional[Dict[str, Any]] = None):
         """Log ChatGPT API response details."""
         self.info("Received response from ChatGPT API", {
             "response_length": len(response),
-            "response_preview": response[:200] + "..." if len(response) > 200 else response,
+            "response_preview": f"{response[:200]}..." if len(response) > 200 else response,
             "usage": usage_data
         })
-        
-        # Also log full response in debug mode
-        self.debug("Full ChatGPT response", {"full_response": response})
+
+        self.debug("Full ChatGPT response", build=lambda: {"full_response": response})
     
     def log_error_with_context(self, error: Exception, context: str, extra_data: Optional[Dict[str, Any]] = None):
         """Log an error with additional context."""
@@ -109,15 +174,19 @@ class KnowledgeLogger:
         """Get a summary of all logs for this processing session."""
         if not self.logs:
             return "No logs recorded."
-        
-        summary = f"Processing completed with {len(self.logs)} log entries:\n"
-        
-        for log in self.logs:
-            timestamp = log["timestamp"].split("T")[1][:8]  # Just time portion
-            summary += f"[{timestamp}] {log['level']}: {log['message']}\n"
-        
-        return summary
+
+        # List + join is linear in total size; += on a str re-copies the
+        # whole summary on every iteration. [11:19] slices the time portion
+        # directly from the fixed-width ISO timestamp without a split.
+        parts = [f"Processing completed with {len(self.logs)} log entries:"]
+        parts.extend(
+            f"[{log.timestamp[11:19]}] {log.level}: {log.message}"
+            for log in self.logs
+        )
+        return "\n".join(parts) + "\n"
     
     def export_logs(self) -> str:
         """Export all logs as JSON string."""
-        return json.dumps(self.logs, indent=2) 
\ No newline at end of file
+        import json  # dev-only path; keep stdlib json off the hot import
+
+        return json.dumps([asdict(entry) for entry in self.logs], indent=2) 
\ No newline at end of file
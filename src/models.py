@@ -2,8 +2,19 @@
 Data models for the knowledge management system.
 """
 from datetime import datetime
-from typing import List, Optional
-from pydantic import BaseModel
+from typing import List, Optional, Tuple
+from pydantic import BaseModel, PrivateAttr
+
+
+# One bound format method shared by every row render - no per-call f-string
+# bytecode re-evaluation and no intermediate concatenations
+_ROW_FMT = "| **{0.number}** | {0.description} | {0.last_validated} |".format
+
+# Static table chrome, built once at import
+_TABLE_HEADER = (
+    "| **#** | **Fact** | **Time Last Validated** |\n"
+    "| ----- | -------- | ----------------------- |\n"
+)
 
 
 class Fact(BaseModel):
@@ -11,26 +22,33 @@ class Fact(BaseModel):
     number: int
     description: str
     last_validated: str  # ISO format date string
-    
+
     def to_table_row(self) -> str:
         """Convert fact to markdown table row format."""
-        return f"| **{self.number}** | {self.description} | {self.last_validated} |"
+        return _ROW_FMT(self)
 
 
 class KnowledgeBase(BaseModel):
     """Complete knowledge base with multiple facts."""
     title: str
     facts: List[Fact]
-    
+
+    # Rendered-markdown cache: (content key, markdown). Building the key is a
+    # cheap tuple walk, far cheaper than re-rendering the table every call.
+    _md_cache: Optional[Tuple[tuple, str]] = PrivateAttr(default=None)
+
+    def _content_key(self) -> tuple:
+        return (self.title, tuple((f.number, f.description, f.last_validated) for f in self.facts))
+
     def to_markdown(self) -> str:
-        """Convert knowledge base to markdown format."""
-        header = f"# {self.title}\n\n"
-        table_header = "| **#** | **Fact** | **Time Last Validated** |\n"
-        table_separator = "| ----- | -------- | ----------------------- |\n"
-        
-        fact_rows = "\n".join([fact.to_table_row() for fact in self.facts])
-        
-        return header + table_header + table_separator + fact_rows
+        """Convert knowledge base to markdown format (cached until facts change)."""
+        key = self._content_key()
+        if self._md_cache is not None and self._md_cache[0] == key:
+            return self._md_cache[1]
+
+        markdown = f"# {self.title}\n\n{_TABLE_HEADER}" + "\n".join(map(_ROW_FMT, self.facts))
+        self._md_cache = (key, markdown)
+        return markdown
 
 
 class SlackMessage(BaseModel):
@@ -0,0 +1,76 @@
+"""
+In-process token-bucket rate limiter for OpenAI API calls.
+
+Instead of firing requests blindly and paying the 429 retry/backoff tax,
+callers estimate their token cost up front and only dispatch when both the
+requests-per-minute and tokens-per-minute buckets allow it. Buckets refill
+continuously from a monotonic clock (leaky-bucket style), so sustained load
+settles at exactly the configured rate.
+"""
+import asyncio
+import os
+import threading
+import time
+from typing import Optional
+
+# Conservative defaults for a gpt-4o tier-1 key; override per deployment
+DEFAULT_RPM = int(os.getenv("OPENAI_RPM", "500"))
+DEFAULT_TPM = int(os.getenv("OPENAI_TPM", "450000"))
+
+
+def estimate_tokens(text: str, output_budget: int = 4000) -> int:
+    """Estimate prompt + completion tokens for a request.
+
+    Uses the ~4 chars/token heuristic for English text; tiktoken would be
+    exact but is a heavy extra dependency for what only needs to be a safe
+    over/under estimate for throttling purposes.
+    """
+    return len(text) // 4 + output_budget
+
+
+class RateLimiter:
+    """Dual token bucket (requests/min + tokens/min) with blocking acquire."""
+
+    def __init__(self, rpm: Optional[int] = None, tpm: Optional[int] = None):
+        self.rpm = rpm if rpm is not None else DEFAULT_RPM
+        self.tpm = tpm if tpm is not None else DEFAULT_TPM
+        # Buckets start full so the first burst is never throttled
+        self._requests = float(self.rpm)
+        self._tokens = float(self.tpm)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._requests = min(float(self.rpm), self._requests + self.rpm * elapsed / 60.0)
+        self._tokens = min(float(self.tpm), self._tokens + self.tpm * elapsed / 60.0)
+
+    def _try_acquire(self, estimated_tokens: int) -> float:
+        """Take capacity if available; otherwise return the seconds to wait."""
+        with self._lock:
+            self._refill()
+            if self._requests >= 1.0 and self._tokens >= estimated_tokens:
+                self._requests -= 1.0
+                self._tokens -= estimated_tokens
+                return 0.0
+            request_wait = max(0.0, (1.0 - self._requests) * 60.0 / self.rpm)
+            token_wait = max(0.0, (estimated_tokens - self._tokens) * 60.0 / self.tpm)
+            return max(request_wait, token_wait)
+
+    def acquire(self, estimated_tokens: int):
+        """Block until the request fits in both buckets."""
+        while True:
+            wait = self._try_acquire(estimated_tokens)
+            if wait <= 0.0:
+                return
+            time.sleep(wait)
+
+    async def aacquire(self, estimated_tokens: int):
+        """Async acquire - sleeps on the event loop instead of the thread."""
+        while True:
+            wait = self._try_acquire(estimated_tokens)
+            if wait <= 0.0:
+                return
+            await asyncio.sleep(wait)
@@ -0,0 +1,55 @@
+"""
+Retry helper for transient database failures.
+"""
+import random
+import time
+
+# Transient transport/server errors worth retrying. Both imports are guarded:
+# in CSV-fallback environments neither httpx nor postgrest is installed, and
+# the retry helper then simply never matches (no retries, single attempt).
+_RETRYABLE: tuple = ()
+try:  # pragma: no cover - depends on installed extras
+    import httpx
+
+    _RETRYABLE += (httpx.TimeoutException, httpx.ConnectError)
+except ImportError:
+    pass
+
+try:  # pragma: no cover - depends on installed extras
+    from postgrest.exceptions import APIError
+
+    _RETRYABLE += (APIError,)
+except ImportError:
+    APIError = None
+
+
+def _is_retryable(error: Exception) -> bool:
+    """True for transport errors and 5xx PostgREST responses.
+
+    4xx API errors (bad request, RLS denial) won't succeed on retry, so
+    they fail fast instead of burning backoff time.
+    """
+    if not isinstance(error, _RETRYABLE):
+        return False
+    if APIError is not None and isinstance(error, APIError):
+        return str(getattr(error, "code", "")).startswith("5")
+    return True
+
+
+def retry_db_operation(fn, *, max_retries: int = 3, base: float = 0.2, cap: float = 2.0):
+    """Call fn(), retrying transient DB errors with jittered backoff.
+
+    The happy path is a single call with no added latency. On a retryable
+    error, attempt i sleeps a uniform random delay in (0, base * 2**i],
+    capped - full jitter, so a burst of failing workers doesn't retry in
+    lockstep against an already-pressured pool. Non-retryable errors and
+    the final failure propagate to the caller's existing except blocks.
+    """
+    for attempt in range(max_retries):
+        try:
+            return fn()
+        except Exception as error:
+            if attempt == max_retries - 1 or not _is_retryable(error):
+                raise
+            time.sleep(random.uniform(0, min(cap, base * 2 ** attempt)))
+    raise RuntimeError("unreachable")  # pragma: no cover
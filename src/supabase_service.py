@@ -1,12 +1,140 @@
+import functools
+import hashlib
 import os
-from typing import Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional
 
-try:
-    from supabase import create_client, Client
+import orjson
+
+from src.retry import retry_db_operation
+
+# Typed failure modes for query methods: transport errors, PostgREST API
+# errors, and missing keys in response rows. Anything else (e.g. a library
+# upgrade changing a response shape) is a bug we want to surface, not a
+# condition to silently fall back on. Guarded like the other optional-dep
+# imports - in CSV-fallback environments no query ever runs anyway.
+_DB_ERRORS: tuple = (KeyError,)
+try:  # pragma: no cover - depends on installed extras
+    import httpx
+
+    _DB_ERRORS += (httpx.HTTPError,)
+except ImportError:
+    pass
+
+try:  # pragma: no cover - depends on installed extras
+    from postgrest.exceptions import APIError
+
+    _DB_ERRORS += (APIError,)
 except ImportError:
-    # If supabase-py is not installed yet, downstream code will fall back automatically
-    create_client = None  # type: ignore
-    Client = None  # type: ignore
+    pass
+
+if TYPE_CHECKING:  # pragma: no cover
+    from supabase import Client
+
+
+@functools.lru_cache(maxsize=None)
+def _build_client(url: str, key: str) -> Optional["Client"]:
+    """Build a Supabase client, memoized per (url, key).
+
+    Every SupabaseService instance (the module singleton, TaskExecutor's,
+    TaskGenerator's, ...) shares one underlying client and therefore one
+    httpx connection pool, instead of re-negotiating TLS per instance.
+    """
+    try:
+        # Deferred import: supabase pulls in httpx/gotrue/postgrest
+        # (~100ms and several MB); CSV-fallback runs never pay for it
+        from supabase import create_client
+
+        client = create_client(url, key)
+        _install_pooled_session(client)
+        return client
+    except Exception:
+        # Fail silently (incl. ImportError) – will fall back to hard-coded data
+        return None
+
+
+def _install_pooled_session(client) -> None:
+    """Swap the PostgREST session for one with explicit keep-alive limits.
+
+    The default client makes no pooling guarantees; with keep-alive pinned
+    open, repeated .execute() calls inside a task loop reuse one TLS
+    connection instead of paying the handshake per request. Best-effort:
+    if the client internals differ across supabase-py versions, the stock
+    session keeps working.
+    """
+    try:
+        import httpx
+
+        postgrest = client.postgrest
+        old_session = postgrest.session
+        postgrest.session = httpx.Client(
+            base_url=old_session.base_url,
+            headers=old_session.headers,
+            limits=httpx.Limits(
+                max_connections=20,
+                max_keepalive_connections=10,
+                keepalive_expiry=60,
+            ),
+            timeout=httpx.Timeout(10.0, connect=5.0),
+        )
+        old_session.close()
+    except Exception:
+        pass
+
+
+# Short-TTL memo for the two read-mostly queries. The data is global, so the
+# cache is module-level and shared by every SupabaseService instance; writes
+# bust the KB entry so the next read sees fresh rows. No cachetools dependency
+# needed for two keys.
+GUIDELINES_TTL_SECONDS = 60.0
+KB_TTL_SECONDS = 30.0
+
+_READ_CACHE = {}
+_READ_CACHE_LOCK = threading.Lock()
+
+
+def _ttl_cached(key, ttl, loader):
+    """Return loader() memoized under key for ttl seconds (None not cached)."""
+    now = time.monotonic()
+    with _READ_CACHE_LOCK:
+        entry = _READ_CACHE.get(key)
+        if entry is not None and now - entry[0] < ttl:
+            return entry[1]
+    value = loader()
+    if value is not None:
+        with _READ_CACHE_LOCK:
+            _READ_CACHE[key] = (time.monotonic(), value)
+    return value
+
+
+def _bust_read_cache(key) -> None:
+    with _READ_CACHE_LOCK:
+        _READ_CACHE.pop(key, None)
+
+
+def _bust_kb_caches() -> None:
+    """Invalidate the KB in this cache AND the hardcoded_data layer above.
+
+    Readers go through get_current_knowledge_base(), which has its own TTL
+    cache; busting only the layer here would leave read-after-write paths
+    (the task loop, queued Slack messages) on the stale copy, silently
+    reverting the rows just written. Deferred import to avoid the cycle -
+    hardcoded_data imports this module at top level.
+    """
+    _bust_read_cache("kb")
+    from src.hardcoded_data import invalidate_knowledge_base_cache
+
+    invalidate_knowledge_base_cache()
+
+
+def _kb_content_hash(snapshot: dict) -> bytes:
+    """Stable 16-byte digest of a facts snapshot (orjson + blake2b)."""
+    return hashlib.blake2b(
+        orjson.dumps(snapshot, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS),
+        digest_size=16,
+    ).digest()
 
 
 class SupabaseService:
@@ -15,80 +143,277 @@ class SupabaseService:
     def __init__(self):
         self.supabase_url = os.getenv("SUPABASE_URL")
         self.supabase_key = os.getenv("SUPABASE_ANON_KEY")
-        self.client: Optional["Client"] = None
+        # Snapshot of the last upserted facts, keyed by number - lets
+        # upsert_knowledge_base send only the rows that actually changed -
+        # plus a digest of it for a single-compare no-op check
+        self._last_upserted: Optional[dict] = None
+        self._last_upsert_hash: Optional[bytes] = None
+
+    @property
+    def client(self) -> Optional["Client"]:
+        """Lazily built Supabase client, shared process-wide per credentials.
+
+        create_client spawns an HTTP client and negotiates TLS, so it only
+        runs on first table access; afterwards this is an lru_cache hit, and
+        every instance with the same credentials gets the same client.
+        """
+        if not (self.supabase_url and self.supabase_key):
+            return None
+        return _build_client(self.supabase_url, self.supabase_key)
 
-        if self.supabase_url and self.supabase_key and create_client:
+    @classmethod
+    def reset(cls) -> None:
+        """Drop the cached clients (e.g. after credentials change in tests).
+
+        The next `client` access rebuilds from whatever credentials the
+        instance holds; new instances re-read the env vars in __init__.
+        """
+        _build_client.cache_clear()
+
+    def warm_up(self) -> None:
+        """Build the client and open a connection on a background thread.
+
+        Fire-and-forget: client construction plus one tiny query overlaps
+        DNS/TLS setup with whatever the caller does next (loading the KB,
+        building prompts), so the first real request hits a warm pool.
+        """
+        def _warm():
             try:
-                self.client = create_client(self.supabase_url, self.supabase_key)
+                client = self.client
+                if client is not None:
+                    client.table("tasks").select("id").limit(1).execute()
             except Exception:
-                # Fail silently – will fall back to hard-coded data
-                self.client = None
+                pass  # best effort - real calls will surface real errors
+
+        threading.Thread(target=_warm, daemon=True).start()
+
+    def close(self) -> None:
+        """Close the pooled PostgREST session (e.g. in one-off scripts)."""
+        client = self.client
+        if client is None:
+            return
+        try:
+            client.postgrest.session.close()
+        except Exception:
+            pass
 
     def fetch_guidelines(self) -> Optional[str]:
-        """Fetch the knowledge-management guidelines from the `guidelines` table.
+        """Fetch the knowledge-management guidelines (TTL-cached).
 
         Returns None on any failure so the caller can fall back to the local copy.
         """
+        return _ttl_cached("guidelines", GUIDELINES_TTL_SECONDS, self._fetch_guidelines)
+
+    def _fetch_guidelines(self) -> Optional[str]:
         if not self.client:
             return None
         try:
-            res = (
+            query = (
                 self.client.table("guidelines")
                 .select("content")
                 .eq("id", 1)
                 .single()
-                .execute()
             )
+            res = retry_db_operation(query.execute)
             return res.data.get("content") if res and res.data else None
-        except Exception:
+        except _DB_ERRORS:
             return None
 
+    def fetch_bootstrap(self):
+        """Fetch the knowledge base and guidelines concurrently.
+
+        The two PostgREST round trips are independent, so overlapping them on
+        a small thread pool costs roughly one RTT instead of two. Returns a
+        (knowledge_base, guidelines) tuple; each element is None on its own
+        failure so callers can fall back per item.
+        """
+        if not self.client:
+            return None, None
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            kb_future = executor.submit(self.fetch_knowledge_base)
+            guidelines_future = executor.submit(self.fetch_guidelines)
+            return kb_future.result(), guidelines_future.result()
+
     # ---------------------------------------------------------------------
     # Knowledge Base
     # ---------------------------------------------------------------------
 
+    # Rows per page when reading the facts table; PostgREST silently caps
+    # unpaginated selects at 1000 rows, so paging is also a correctness fix
+    FETCH_PAGE_SIZE = 500
+
+    def _facts_query(self):
+        return (
+            self.client.table("facts")
+            .select("number, description, last_validated", count="exact")
+            .order("number")
+        )
+
     def fetch_knowledge_base(self):
-        """Return a KnowledgeBase object built from the `facts` table, or None."""
+        """Return a KnowledgeBase built from the `facts` table (TTL-cached), or None.
+
+        The cache is busted by upsert_knowledge_base, so a task loop that
+        writes between reads still observes its own updates.
+        """
+        return _ttl_cached("kb", KB_TTL_SECONDS, self._fetch_knowledge_base)
+
+    def _fetch_knowledge_base(self):
+        """Uncached fetch: the first page ships with an exact row count; any
+        remaining pages are fetched concurrently so a large KB costs ~2 RTTs
+        instead of silently truncating at PostgREST's default limit.
+        """
         if not self.client:
             return None
         try:
             from src.models import Fact, KnowledgeBase  # local import to avoid circular
 
-            res = (
-                self.client.table("facts")
-                .select("number, description, last_validated")
-                .order("number")
-                .execute()
-            )
+            page_size = self.FETCH_PAGE_SIZE
+            first = retry_db_operation(self._facts_query().range(0, page_size - 1).execute)
 
-            if not res or not res.data:
+            if not first or not first.data:
                 return None
 
+            rows = list(first.data)
+            total = first.count or len(rows)
+            if total > len(rows):
+                starts = range(len(rows), total, page_size)
+
+                def fetch_page(start):
+                    res = retry_db_operation(
+                        self._facts_query().range(start, start + page_size - 1).execute
+                    )
+                    return res.data or []
+
+                with ThreadPoolExecutor(max_workers=min(8, len(starts))) as executor:
+                    for page in executor.map(fetch_page, starts):
+                        rows.extend(page)
+
+            # model_construct skips per-field validation; the rows come from
+            # our own typed table, so re-validating them is wasted work
             facts = [
-                Fact(
+                Fact.model_construct(
                     number=row["number"],
                     description=row["description"],
                     last_validated=row["last_validated"],
                 )
-                for row in res.data
+                for row in rows
             ]
 
             return KnowledgeBase(title="Current RN Project Facts", facts=facts)
-        except Exception:
+        except _DB_ERRORS:
             return None
 
+    def iter_facts(self):
+        """Yield Facts from the `facts` table one page at a time.
+
+        Unlike fetch_knowledge_base this never holds more than one page of
+        raw rows in memory, so streaming consumers (exports, diffs) keep
+        peak RSS flat regardless of KB size. Stops silently on error -
+        callers needing fallback semantics should use fetch_knowledge_base.
+        """
+        if not self.client:
+            return
+        from src.models import Fact  # local import to avoid circular
+
+        page_size = self.FETCH_PAGE_SIZE
+        start = 0
+        while True:
+            try:
+                res = retry_db_operation(
+                    self._facts_query().range(start, start + page_size - 1).execute
+                )
+            except _DB_ERRORS:
+                return
+            rows = res.data if res else None
+            if not rows:
+                return
+            for row in rows:
+                yield Fact.model_construct(
+                    number=row["number"],
+                    description=row["description"],
+                    last_validated=row["last_validated"],
+                )
+            if len(rows) < page_size:
+                return
+            start += page_size
+
+    def fetch_fact_numbers(self):
+        """Return the set of fact numbers currently in the `facts` table.
+
+        Selects only the `number` column, so the payload is a few bytes per
+        row instead of the full description text - handy for existence
+        checks without the cost of fetch_knowledge_base.
+        """
+        if not self.client:
+            return set()
+        try:
+            res = retry_db_operation(self.client.table("facts").select("number").execute)
+            if not res or not res.data:
+                return set()
+            return {row["number"] for row in res.data}
+        except _DB_ERRORS:
+            return set()
+
     # ------------------------------------------------------------------
     # Write helpers
     # ------------------------------------------------------------------
 
     def upsert_knowledge_base(self, kb):
-        """Upsert all facts from a KnowledgeBase into the `facts` table.
+        """Upsert facts from a KnowledgeBase into the `facts` table.
+
+        Only rows that differ from the previous upsert are sent - in a task
+        loop that writes the whole KB per task but typically touches a couple
+        of facts, this shrinks the payload from all-N rows to the delta (and
+        skips the round trip entirely when nothing changed).
 
         Requires a key with write permissions (service role or anon with RLS off).
         Returns True on success, False on failure.
         """
         if not self.client or not kb:
             return False
+        try:
+            snapshot = {
+                fact.number: (fact.description, fact.last_validated)
+                for fact in kb.facts
+            }
+            # Fast path for idempotent tasks: one digest compare decides the
+            # whole call before any per-row diffing happens
+            content_hash = _kb_content_hash(snapshot)
+            if content_hash == self._last_upsert_hash:
+                return True
+            previous = self._last_upserted
+            rows = [
+                {
+                    "number": number,
+                    "description": description,
+                    "last_validated": last_validated,
+                }
+                for number, (description, last_validated) in snapshot.items()
+                if previous is None or previous.get(number) != (description, last_validated)
+            ]
+
+            if rows:
+                # Perform upsert (on conflict number)
+                retry_db_operation(self.client.table("facts").upsert(rows).execute)
+                # Next read must see the rows we just wrote
+                _bust_kb_caches()
+            self._last_upserted = snapshot
+            self._last_upsert_hash = content_hash
+            return True
+        except _DB_ERRORS:
+            return False
+
+    def execute_task(self, task_id: int, kb) -> bool:
+        """Upsert a KB and delete the completed task in one transaction.
+
+        Calls the `execute_task` Postgres function (scripts/sql/
+        execute_task.sql): one round trip instead of upsert + delete, and
+        the two writes commit or roll back together. Returns False when the
+        function isn't deployed (or on any other failure) so callers can
+        fall back to the separate upsert/delete path.
+        """
+        if not self.client or not kb or not task_id:
+            return False
         try:
             rows = [
                 {
@@ -98,11 +423,22 @@ class SupabaseService:
                 }
                 for fact in kb.facts
             ]
-
-            # Perform upsert (on conflict number)
-            self.client.table("facts").upsert(rows).execute()
+            retry_db_operation(
+                self.client.rpc(
+                    "execute_task", {"task_id": task_id, "new_facts": rows}
+                ).execute
+            )
+            # Same bookkeeping as upsert_knowledge_base: readers must see the
+            # new rows, and the next diff starts from this snapshot
+            _bust_kb_caches()
+            snapshot = {
+                fact.number: (fact.description, fact.last_validated)
+                for fact in kb.facts
+            }
+            self._last_upserted = snapshot
+            self._last_upsert_hash = _kb_content_hash(snapshot)
             return True
-        except Exception:
+        except _DB_ERRORS:
             return False
 
     # ------------------------------------------------------------------
@@ -117,18 +453,18 @@ class SupabaseService:
         if not self.client:
             return []
         try:
-            res = (
+            query = (
                 self.client.table("tasks")
                 .select("title")
                 .order("created_at", desc=True)
-                .execute()
             )
+            res = retry_db_operation(query.execute)
             
             if not res or not res.data:
                 return []
                 
             return [row["title"] for row in res.data]
-        except Exception:
+        except _DB_ERRORS:
             return []
 
     def fetch_automated_tasks(self):
@@ -139,21 +475,46 @@ class SupabaseService:
         if not self.client:
             return []
         try:
-            res = (
+            query = (
                 self.client.table("tasks")
                 .select("id, title")
                 .eq("needs_human", False)
                 .order("created_at", desc=False)  # Oldest first for execution
-                .execute()
             )
+            res = retry_db_operation(query.execute)
             
             if not res or not res.data:
                 return []
                 
             return res.data
-        except Exception:
+        except _DB_ERRORS:
             return []
 
+    def fetch_tasks_split(self):
+        """Fetch all tasks once and return them partitioned by needs_human.
+
+        One round trip instead of separate automated/human queries; the
+        split itself is two list comprehensions over rows already in
+        memory. Returns an (automated, human) tuple of row-dict lists,
+        both empty on failure.
+        """
+        if not self.client:
+            return [], []
+        try:
+            query = (
+                self.client.table("tasks")
+                .select("id, title, needs_human")
+                .order("created_at", desc=False)  # Oldest first for execution
+            )
+            res = retry_db_operation(query.execute)
+
+            rows = res.data if res and res.data else []
+            automated = [row for row in rows if not row.get("needs_human")]
+            human = [row for row in rows if row.get("needs_human")]
+            return automated, human
+        except _DB_ERRORS:
+            return [], []
+
     def delete_task(self, task_id: int) -> bool:
         """Delete a task by its ID.
         
@@ -162,9 +523,41 @@ class SupabaseService:
         if not self.client or not task_id:
             return False
         try:
-            self.client.table("tasks").delete().eq("id", task_id).execute()
+            retry_db_operation(self.client.table("tasks").delete().eq("id", task_id).execute)
             return True
-        except Exception:
+        except _DB_ERRORS:
+            return False
+
+    def delete_tasks(self, task_ids) -> bool:
+        """Delete several tasks in one round trip via `.in_("id", ...)`.
+
+        Returns True on success (including an empty id list), False on failure.
+        """
+        if not self.client:
+            return False
+        if not task_ids:
+            return True
+        try:
+            retry_db_operation(self.client.table("tasks").delete().in_("id", list(task_ids)).execute)
+            return True
+        except _DB_ERRORS:
+            return False
+
+    def add_tasks_bulk(self, rows) -> bool:
+        """Insert several task rows in one request.
+
+        Each row is {"title": ..., "needs_human": ...}. One round trip for
+        the whole batch instead of one per task; PostgREST inserts are
+        atomic, so it's all rows or none. Returns True on success.
+        """
+        if not self.client:
+            return False
+        if not rows:
+            return True
+        try:
+            retry_db_operation(self.client.table("tasks").insert(list(rows)).execute)
+            return True
+        except _DB_ERRORS:
             return False
 
     def add_task(self, task_description: str, needs_human: bool = False) -> bool:
@@ -175,10 +568,16 @@ class SupabaseService:
         if not self.client or not task_description:
             return False
         try:
-            self.client.table("tasks").insert({
+            query = self.client.table("tasks").insert({
                 "title": task_description,
                 "needs_human": needs_human
-            }).execute()
+            })
+            retry_db_operation(query.execute)
             return True
-        except Exception:
-            return False 
\ No newline at end of file
+        except _DB_ERRORS:
+            return False
+
+
+# Shared instance: client construction is lazy, so importing this is free and
+# every caller reuses one connection pool across warm invocations
+supabase_service = SupabaseService()
@@ -3,6 +3,8 @@ Task execution service for automated knowledge management tasks.
 """
 import os
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Dict, Any
 from src.chatgpt_service import ChatGPTService
 from src.logger import KnowledgeLogger
@@ -11,34 +13,17 @@ from src.supabase_service import SupabaseService
 from src.models import KnowledgeBase
 
 
-class TaskExecutor:
-    """Service for executing automated knowledge management tasks using ChatGPT."""
-    
-    def __init__(self, logger: KnowledgeLogger):
-        self.logger = logger
-        self.chatgpt_service = ChatGPTService(logger)
-        self.supabase_service = SupabaseService()
-        
-    def _create_task_execution_prompt(
-        self, 
-        knowledge_base_content: str, 
-        guidelines: str, 
-        task_to_execute: str
-    ) -> str:
-        """Create the prompt for ChatGPT to execute a single task and update the knowledge base."""
-        
-        prompt = f"""You are a fact-based knowledge management system. Your task is to execute a specific knowledge management task by updating the knowledge base according to the guidelines.
+# The execution prompt is 99% constant text; building it as two module-level
+# halves means each call only interpolates the three dynamic fields instead
+# of re-assembling ~4KB of instructions per task.
+_PROMPT_HEAD = """You are a fact-based knowledge management system. Your task is to execute a specific knowledge management task by updating the knowledge base according to the guidelines.
 
 ## INPUT INFORMATION
 
 ### Current Knowledge Base
-{knowledge_base_content}
-
-### Knowledge Management Guidelines
-{guidelines}
+"""
 
-### Task to Execute
-{task_to_execute}
+_PROMPT_TAIL = """
 
 ## YOUR TASK
 
@@ -71,11 +56,123 @@ Respond with ONLY a properly formatted markdown table of the updated knowledge b
 
 Do not include any explanation, analysis, or additional text. Only return the updated knowledge base table."""
 
-        return prompt
+
+class TaskExecutor:
+    """Service for executing automated knowledge management tasks using ChatGPT."""
+    
+    def __init__(self, logger: KnowledgeLogger):
+        self.logger = logger
+        self.chatgpt_service = ChatGPTService(logger)
+        self.supabase_service = SupabaseService()
+        # Overlap DNS/TLS setup with guideline/KB loading so the first
+        # fetch_automated_tasks call hits a warm connection
+        self.supabase_service.warm_up()
+        # Serializes KB read-modify-write when tasks run concurrently
+        self._write_lock = threading.Lock()
+
+
+    def _create_task_execution_prompt(
+        self, 
+        knowledge_base_content: str, 
+        guidelines: str, 
+        task_to_execute: str
+    ) -> str:
+        """Create the prompt for ChatGPT to execute a single task and update the knowledge base."""
+        return (
+            f"{_PROMPT_HEAD}{knowledge_base_content}\n\n"
+            f"### Knowledge Management Guidelines\n{guidelines}\n\n"
+            f"### Task to Execute\n{task_to_execute}{_PROMPT_TAIL}"
+        )
     
-    def execute_automated_tasks(self) -> Dict[str, Any]:
+    def _execute_single_task(self, task: Dict[str, Any], guidelines: str, position: str) -> bool:
+        """Execute one automated task end to end; returns True on success.
+
+        The ChatGPT call (the slow, latency-bound part) runs outside the
+        write lock; only the KB read + upsert is serialized so concurrent
+        tasks don't clobber each other's updates.
+        """
+        self.logger.info(f"Executing task {position}: {task['title'][:50]}...")
+
+        # Get fresh knowledge base for each task (so updates accumulate)
+        knowledge_base = get_current_knowledge_base()
+        if not knowledge_base:
+            self.logger.error(f"Failed to load knowledge base for task: {task['title']}")
+            return False
+
+        # Create the execution prompt for this single task
+        prompt = self._create_task_execution_prompt(
+            knowledge_base.to_markdown(),
+            guidelines,
+            task["title"]
+        )
+
+        # Log the request
+        self.logger.log_chatgpt_request(prompt, self.chatgpt_service.model, 0.0)
+
+        # Make the API call to execute this single task
+        if self.chatgpt_service.is_reasoning_model:
+            response = self.chatgpt_service.client.chat.completions.create(
+                model=self.chatgpt_service.model,
+                messages=[
+                    {"role": "user", "content": f"You are a precise fact-based knowledge management system. Execute the task exactly as specified.\n\n{prompt}"}
+                ],
+                max_completion_tokens=4000
+            )
+        else:
+            response = self.chatgpt_service.client.chat.completions.create(
+                model=self.chatgpt_service.model,
+                messages=[
+                    {"role": "system", "content": "You are a precise fact-based knowledge management system. Execute the task exactly as specified."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.1,
+                max_tokens=4000
+            )
+
+        # Extract response content and usage data
+        response_content = response.choices[0].message.content
+        usage_data = {
+            "prompt_tokens": response.usage.prompt_tokens,
+            "completion_tokens": response.usage.completion_tokens,
+            "total_tokens": response.usage.total_tokens
+        }
+
+        # Log the response
+        self.logger.log_chatgpt_response(response_content, usage_data)
+
+        # Parse the response into an updated knowledge base
+        updated_knowledge_base = self.chatgpt_service._parse_knowledge_base_response(response_content)
+
+        if not updated_knowledge_base or not updated_knowledge_base.facts:
+            self.logger.error(f"Failed to parse updated knowledge base for task: {task['title']}")
+            return False
+
+        # Update Supabase with the new knowledge base. The execute_task RPC
+        # commits the KB upsert and the task deletion in one transaction
+        # (one round trip); when the function isn't deployed we fall back to
+        # the separate upsert, with the bulk delete after the loop cleaning
+        # up either way (deleting an already-deleted id is a no-op).
+        with self._write_lock:
+            update_success = self.supabase_service.execute_task(task["id"], updated_knowledge_base)
+            if not update_success:
+                update_success = self.supabase_service.upsert_knowledge_base(updated_knowledge_base)
+
+        if not update_success:
+            self.logger.error(f"Failed to update knowledge base for task: {task['title']}")
+            return False
+
+        self.logger.info(f"Successfully completed task: {task['title'][:50]}...")
+        return True
+
+    def execute_automated_tasks(self, concurrency: int = 1) -> Dict[str, Any]:
         """
-        Execute automated tasks one at a time to avoid timeouts.
+        Execute automated tasks, by default one at a time to avoid timeouts.
+
+        With concurrency > 1 the per-task ChatGPT calls (the wall-clock
+        bottleneck) overlap on a thread pool; KB writes stay serialized
+        behind a lock. Opt-in because concurrent tasks each start from the
+        same KB snapshot, so their fact edits should not overlap.
+
         Returns a summary of the execution results.
         """
         try:
@@ -106,88 +203,37 @@ Do not include any explanation, analysis, or additional text. Only return the up
                     "tasks_completed": 0
                 }
             
-            # Execute tasks one at a time
+            # Completed ids are deleted in one bulk round trip after the
+            # loop instead of one DELETE per task
             executed_tasks = []
-            completed_count = 0
-            
-            for i, task in enumerate(automated_tasks):
+            completed_ids = []
+            total = len(automated_tasks)
+
+            def run_task(i_task):
+                i, task = i_task
                 try:
-                    self.logger.info(f"Executing task {i+1}/{len(automated_tasks)}: {task['title'][:50]}...")
-                    
-                    # Get fresh knowledge base for each task (so updates accumulate)
-                    knowledge_base = get_current_knowledge_base()
-                    if not knowledge_base:
-                        self.logger.error(f"Failed to load knowledge base for task: {task['title']}")
-                        continue
-                    
-                    # Create the execution prompt for this single task
-                    prompt = self._create_task_execution_prompt(
-                        knowledge_base.to_markdown(),
-                        guidelines,
-                        task["title"]
-                    )
-                    
-                    # Log the request
-                    self.logger.log_chatgpt_request(prompt, self.chatgpt_service.model, 0.0)
-                    
-                    # Make the API call to execute this single task
-                    if self.chatgpt_service.model.startswith("o1") or self.chatgpt_service.model.startswith("o3"):
-                        response = self.chatgpt_service.client.chat.completions.create(
-                            model=self.chatgpt_service.model,
-                            messages=[
-                                {"role": "user", "content": f"You are a precise fact-based knowledge management system. Execute the task exactly as specified.\n\n{prompt}"}
-                            ],
-                            max_completion_tokens=4000
-                        )
-                    else:
-                        response = self.chatgpt_service.client.chat.completions.create(
-                            model=self.chatgpt_service.model,
-                            messages=[
-                                {"role": "system", "content": "You are a precise fact-based knowledge management system. Execute the task exactly as specified."},
-                                {"role": "user", "content": prompt}
-                            ],
-                            temperature=0.1,
-                            max_tokens=4000
-                        )
-                    
-                    # Extract response content and usage data
-                    response_content = response.choices[0].message.content
-                    usage_data = {
-                        "prompt_tokens": response.usage.prompt_tokens,
-                        "completion_tokens": response.usage.completion_tokens,
-                        "total_tokens": response.usage.total_tokens
-                    }
-                    
-                    # Log the response
-                    self.logger.log_chatgpt_response(response_content, usage_data)
-                    
-                    # Parse the response into an updated knowledge base
-                    updated_knowledge_base = self.chatgpt_service._parse_knowledge_base_response(response_content)
-                    
-                    if not updated_knowledge_base or not updated_knowledge_base.facts:
-                        self.logger.error(f"Failed to parse updated knowledge base for task: {task['title']}")
-                        continue
-                    
-                    # Update Supabase with the new knowledge base
-                    update_success = self.supabase_service.upsert_knowledge_base(updated_knowledge_base)
-                    
-                    if not update_success:
-                        self.logger.error(f"Failed to update knowledge base for task: {task['title']}")
-                        continue
-                    
-                    # Remove this completed task
-                    if self.supabase_service.delete_task(task["id"]):
-                        completed_count += 1
-                        executed_tasks.append(task["title"])
-                        self.logger.info(f"Successfully completed task: {task['title'][:50]}...")
-                    else:
-                        self.logger.warning(f"Failed to delete completed task {task['id']}: {task['title'][:50]}...")
-                    
+                    return self._execute_single_task(task, guidelines, f"{i + 1}/{total}")
                 except Exception as e:
                     self.logger.error(f"Error executing task '{task['title']}': {str(e)}")
-                    # Continue with next task instead of stopping entirely
-                    continue
-            
+                    # Don't let one failing task stop the rest
+                    return False
+
+            if concurrency > 1:
+                with ThreadPoolExecutor(max_workers=min(concurrency, total)) as executor:
+                    results = list(executor.map(run_task, enumerate(automated_tasks)))
+            else:
+                results = [run_task(item) for item in enumerate(automated_tasks)]
+
+            for task, success in zip(automated_tasks, results):
+                if success:
+                    completed_ids.append(task["id"])
+                    executed_tasks.append(task["title"])
+
+            # Remove all completed tasks with a single bulk delete
+            if completed_ids and not self.supabase_service.delete_tasks(completed_ids):
+                self.logger.warning(f"Failed to delete {len(completed_ids)} completed tasks: {completed_ids}")
+
+            completed_count = len(completed_ids)
             self.logger.info(f"Task execution complete: {completed_count}/{len(automated_tasks)} tasks successfully executed")
             
             return {
@@ -1,48 +1,33 @@
 """
 Task generation service using ChatGPT to create new knowledge management tasks.
 """
-import os
-import json
+import hashlib
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
-from src.chatgpt_service import ChatGPTService
-from src.logger import KnowledgeLogger
-from src.hardcoded_data import get_current_knowledge_base, get_knowledge_guidelines
-from src.supabase_service import SupabaseService
-
 
-class TaskGenerator:
-    """Service for generating knowledge management tasks using ChatGPT."""
-    
-    def __init__(self, logger: KnowledgeLogger):
-        self.logger = logger
-        self.chatgpt_service = ChatGPTService(logger)
-        self.supabase_service = SupabaseService()
-        
-    def _create_task_generation_prompt(
-        self, 
-        knowledge_base_content: str, 
-        guidelines: str, 
-        existing_tasks: List[str]
-    ) -> str:
-        """Create the prompt for ChatGPT to generate new tasks."""
-        existing_tasks_text = "\n".join([f"- {task}" for task in existing_tasks]) if existing_tasks else "No existing tasks"
-        
-        prompt = f"""You are a knowledge management task generator. Your job is to analyze a fact-based knowledge base and generate actionable tasks to improve and maintain it.
+import orjson
 
-## INPUT INFORMATION
+from src.logger import KnowledgeLogger
 
-### Current Knowledge Base
-{knowledge_base_content}
+# ChatGPTService (which drags in the OpenAI SDK) and SupabaseService are
+# imported lazily in __init__, and hardcoded_data inside generate_tasks, so
+# handlers that never build a TaskGenerator skip their import cost on
+# serverless cold starts.
 
-### Knowledge Management Guidelines
-{guidelines}
 
-### Existing Tasks
-{existing_tasks_text}
+# Static prompt prefix, byte-identical across calls. OpenAI's automatic
+# prompt caching only matches exact prefixes, so all constant text (role,
+# focus areas, requirements, output schema) comes first and the volatile
+# KB/guidelines/tasks are appended after it - repeated generate_tasks calls
+# then reuse the cached prefix regardless of KB churn. Both model branches
+# share this string so they hit the same cache entry.
+_TASK_GEN_STATIC_PREFIX = """You are a knowledge management task generator. Your job is to analyze a fact-based knowledge base and generate actionable tasks to improve and maintain it.
 
 ## YOUR TASK
 
-Based on the knowledge base and guidelines, generate 3-5 specific, actionable tasks that would improve the knowledge base. Focus on:
+Based on the knowledge base and guidelines given below, generate 3-5 specific, actionable tasks that would improve the knowledge base. Focus on:
 
 1. **Data Quality Issues**: Missing validation dates, outdated information, inconsistent terminology
 2. **Information Gaps**: Areas where more detail would be valuable
@@ -60,14 +45,123 @@ Based on the knowledge base and guidelines, generate 3-5 specific, actionable ta
 
 ## OUTPUT FORMAT
 
-Respond with ONLY a JSON array of task strings. No additional text, explanations, or formatting.
+Respond with ONLY a JSON object holding an array of task strings. No additional text, explanations, or formatting.
 
 Example format:
-["Task 1 description", "Task 2 description", "Task 3 description"]
+{"tasks": ["Task 1 description", "Task 2 description", "Task 3 description"]}
+
+Do not include any explanation or additional text outside the JSON object.
+
+## INPUT INFORMATION
+"""
+
+# Structured-output schema enforced server-side on the chat branch: the
+# model cannot return prose, fences or a bare array, so the parser's
+# defensive paths become fallbacks for the reasoning branch only.
+_TASKS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "tasks",
+        "schema": {
+            "type": "object",
+            "properties": {
+                "tasks": {
+                    "type": "array",
+                    "items": {"type": "string", "minLength": 1},
+                }
+            },
+            "required": ["tasks"],
+            "additionalProperties": False,
+        },
+        "strict": True,
+    },
+}
+
+
+# Task-classification keywords, compiled once into regex alternations: one
+# C-level scan per pattern instead of a Python loop of ~25 substring checks
+# per task. Keywords that typically indicate human input needed:
+_HUMAN_NEEDED_KEYWORDS = (
+    "clarify", "confirm", "verify with", "ask", "check with",
+    "review with", "validate with", "coordinate with",
+    "decision", "approve", "priority", "stakeholder",
+    "external", "contact", "reach out", "interview",
+    "survey", "gather feedback", "meeting", "discussion",
+    "strategic", "business judgment", "policy",
+    "manual review", "human verification",
+)
+
+# Keywords that typically indicate automated execution possible:
+_AUTOMATED_KEYWORDS = (
+    "update", "merge", "consolidate", "audit", "scan",
+    "refresh", "revise", "archive", "validate dates",
+    "check existing", "review facts", "update validation",
+    "remove duplicate", "fix", "correct", "standardize",
+)
+
+_HUMAN_RE = re.compile("|".join(map(re.escape, _HUMAN_NEEDED_KEYWORDS)))
+_AUTO_RE = re.compile("|".join(map(re.escape, _AUTOMATED_KEYWORDS)))
+# Indicators that the task only touches existing knowledge base data
+_DATA_RE = re.compile(r"facts|knowledge base|validation|data")
+
+# First-to-last bracket span of the response body; tolerates markdown fences
+# or stray prose around the array without chained strip/slice passes
+_JSON_ARRAY_RE = re.compile(rb"\[.*\]", re.S)
+
+
+class TaskGenerator:
+    """Service for generating knowledge management tasks using ChatGPT."""
+    
+    # Scheduled runs often fire with an unchanged KB/guidelines/task set;
+    # half an hour of reuse turns those into a hash + dict lookup
+    DEFAULT_CACHE_TTL_SECONDS = 1800.0
+
+    def __init__(self, logger: KnowledgeLogger, cache_ttl: float = DEFAULT_CACHE_TTL_SECONDS):
+        from src.chatgpt_service import ChatGPTService
+        from src.supabase_service import SupabaseService
+
+        self.logger = logger
+        self.chatgpt_service = ChatGPTService(logger)
+        self.supabase_service = SupabaseService()
+        # Exact-match response cache: input-state hash -> (stored_at, tasks)
+        self._response_cache = {}
+        self._cache_ttl = cache_ttl
+
+    def _cache_key(self, kb_markdown: str, guidelines: str, existing_tasks: List[str]) -> str:
+        """Hash of everything that influences the model output."""
+        return hashlib.sha256(
+            b"\x1f".join([
+                kb_markdown.encode(),
+                guidelines.encode(),
+                "\n".join(sorted(existing_tasks)).encode(),
+                self.chatgpt_service.model.encode(),
+            ])
+        ).hexdigest()
+
+    def clear_cache(self) -> None:
+        """Drop all cached generation results."""
+        self._response_cache.clear()
+
+
+    def _create_task_generation_prompt(
+        self, 
+        knowledge_base_content: str, 
+        guidelines: str, 
+        existing_tasks: List[str]
+    ) -> str:
+        """Create the prompt for ChatGPT to generate new tasks.
 
-Do not include any explanation or additional text outside the JSON array."""
+        Static instructions first, volatile content last - see
+        _TASK_GEN_STATIC_PREFIX for the caching rationale.
+        """
+        existing_tasks_text = "\n".join([f"- {task}" for task in existing_tasks]) if existing_tasks else "No existing tasks"
 
-        return prompt
+        return (
+            f"{_TASK_GEN_STATIC_PREFIX}\n"
+            f"### Current Knowledge Base\n{knowledge_base_content}\n\n"
+            f"### Knowledge Management Guidelines\n{guidelines}\n\n"
+            f"### Existing Tasks\n{existing_tasks_text}"
+        )
     
     def _analyze_if_task_needs_human(self, task: str) -> bool:
         """Analyze a task to determine if it needs human input.
@@ -76,59 +170,54 @@ Do not include any explanation or additional text outside the JSON array."""
         Returns False if it can be executed automatically using available data.
         """
         task_lower = task.lower()
-        
-        # Keywords that typically indicate human input needed
-        human_needed_keywords = [
-            "clarify", "confirm", "verify with", "ask", "check with",
-            "review with", "validate with", "coordinate with",
-            "decision", "approve", "priority", "stakeholder",
-            "external", "contact", "reach out", "interview",
-            "survey", "gather feedback", "meeting", "discussion",
-            "strategic", "business judgment", "policy",
-            "manual review", "human verification"
-        ]
-        
-        # Keywords that typically indicate automated execution possible
-        automated_keywords = [
-            "update", "merge", "consolidate", "audit", "scan",
-            "refresh", "revise", "archive", "validate dates",
-            "check existing", "review facts", "update validation",
-            "remove duplicate", "fix", "correct", "standardize"
-        ]
-        
+
         # Check for human-needed indicators
-        for keyword in human_needed_keywords:
-            if keyword in task_lower:
-                return True
-        
-        # If it's purely about updating existing data/facts, likely automated
-        for keyword in automated_keywords:
-            if keyword in task_lower:
-                # Check if it's just updating existing knowledge base data
-                if any(indicator in task_lower for indicator in ["facts", "knowledge base", "validation", "data"]):
-                    return False
-        
+        if _HUMAN_RE.search(task_lower):
+            return True
+
+        # If it's purely about updating existing knowledge base data,
+        # likely automated
+        if _AUTO_RE.search(task_lower) and _DATA_RE.search(task_lower):
+            return False
+
         # Default to needing human input for safety
         return True
+
+    def classify_batch(self, tasks: List[str]) -> List[bool]:
+        """Classify many tasks in one pass; returns needs_human per task.
+
+        Each task costs one lowercase plus at most three C-level scans of
+        the precompiled alternations - linear in total text size and
+        independent of the keyword-list length.
+        """
+        return [self._analyze_if_task_needs_human(task) for task in tasks]
     
     def _parse_task_response(self, response: str) -> List[str]:
-        """Parse ChatGPT response into a list of tasks."""
+        """Parse ChatGPT response into a list of tasks.
+
+        The structured-output schema guarantees a {"tasks": [...]} object
+        on the chat branch, so the common case is one orjson.loads. The
+        regex fallback covers the reasoning branch (no response_format),
+        where the array may arrive fenced or wrapped in prose.
+        """
         try:
-            # Clean the response by removing any markdown formatting
-            cleaned_response = response.strip()
-            if cleaned_response.startswith("```json"):
-                cleaned_response = cleaned_response[7:]
-            if cleaned_response.endswith("```"):
-                cleaned_response = cleaned_response[:-3]
-            cleaned_response = cleaned_response.strip()
-            
-            # Parse JSON
-            tasks = json.loads(cleaned_response)
-            
+            raw = response.encode()
+            try:
+                tasks = orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                match = _JSON_ARRAY_RE.search(raw)
+                if not match:
+                    self.logger.warning("No JSON array found in ChatGPT response", {"response": response})
+                    return []
+                tasks = orjson.loads(match.group(0))
+
+            if isinstance(tasks, dict):
+                tasks = tasks.get("tasks")
+
             if not isinstance(tasks, list):
                 self.logger.warning("ChatGPT response is not a list", {"response": response})
                 return []
-                
+
             # Validate each task is a string
             valid_tasks = []
             for task in tasks:
@@ -136,11 +225,11 @@ Do not include any explanation or additional text outside the JSON array."""
                     valid_tasks.append(task.strip())
                 else:
                     self.logger.warning(f"Invalid task format: {task}")
-                    
+
             self.logger.info(f"Successfully parsed {len(valid_tasks)} tasks from ChatGPT response")
             return valid_tasks
-            
-        except json.JSONDecodeError as e:
+
+        except orjson.JSONDecodeError as e:
             self.logger.error(f"Failed to parse ChatGPT response as JSON: {e}", {"response": response})
             return []
         except Exception as e:
@@ -152,33 +241,49 @@ Do not include any explanation or additional text outside the JSON array."""
         Generate new knowledge management tasks using ChatGPT.
         Returns list of task strings, or None if an error occurs.
         """
+        from src.hardcoded_data import get_current_knowledge_base, get_knowledge_guidelines
+
         try:
             self.logger.info("Starting task generation process")
-            
-            # Get current knowledge base
-            knowledge_base = get_current_knowledge_base()
+
+            # The three inputs are independent I/O-bound loads; overlapping
+            # them costs max(latencies) instead of the sum
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                kb_future = executor.submit(get_current_knowledge_base)
+                guidelines_future = executor.submit(get_knowledge_guidelines)
+                tasks_future = executor.submit(self.supabase_service.fetch_tasks)
+                knowledge_base = kb_future.result()
+                guidelines = guidelines_future.result()
+                existing_tasks = tasks_future.result()
+
             if not knowledge_base:
                 self.logger.error("Failed to load current knowledge base")
                 return None
-                
-            # Get guidelines
-            guidelines = get_knowledge_guidelines()
+
             if not guidelines:
                 self.logger.error("Failed to load knowledge guidelines")
                 return None
-                
-            # Get existing tasks from database
-            existing_tasks = self.supabase_service.fetch_tasks()
             
-            self.logger.info("Loaded data for task generation", {
+            # build= defers the payload dict; production info logging never
+            # touches it, so the allocation is skipped there entirely
+            self.logger.info("Loaded data for task generation", build=lambda: {
                 "facts_count": len(knowledge_base.facts),
                 "guidelines_length": len(guidelines),
                 "existing_tasks_count": len(existing_tasks)
             })
-            
+
+            # Identical input state within the TTL -> reuse the parsed
+            # result without an API call
+            kb_markdown = knowledge_base.to_markdown()
+            cache_key = self._cache_key(kb_markdown, guidelines, existing_tasks)
+            cached = self._response_cache.get(cache_key)
+            if cached is not None and time.time() - cached[0] < self._cache_ttl:
+                self.logger.info(f"Returning {len(cached[1])} cached tasks (input state unchanged)")
+                return list(cached[1])
+
             # Create the prompt
             prompt = self._create_task_generation_prompt(
-                knowledge_base.to_markdown(),
+                kb_markdown,
                 guidelines,
                 existing_tasks
             )
@@ -187,32 +292,56 @@ Do not include any explanation or additional text outside the JSON array."""
             self.logger.log_chatgpt_request(prompt, self.chatgpt_service.model, 0.0)
             
             # Make the API call
-            if self.chatgpt_service.model.startswith("o1") or self.chatgpt_service.model.startswith("o3"):
+            # prompt_cache_key keeps routing sticky so repeat generations
+            # land on a server with the prefix already cached; sent via
+            # extra_body to stay compatible with older SDK releases
+            cache_routing = {"prompt_cache_key": f"{self.chatgpt_service.model}:task_gen"}
+            if self.chatgpt_service.is_reasoning_model:
+                # The role preamble lives in the shared static prefix, so
+                # both branches present one byte-identical cacheable prefix
                 response = self.chatgpt_service.client.chat.completions.create(
                     model=self.chatgpt_service.model,
                     messages=[
-                        {"role": "user", "content": f"You are a knowledge management task generator. Follow instructions exactly.\n\n{prompt}"}
+                        {"role": "user", "content": prompt}
                     ],
-                    max_completion_tokens=2000
+                    max_completion_tokens=2000,
+                    extra_body=cache_routing
                 )
+
+                response_content = response.choices[0].message.content
+                usage = response.usage
             else:
-                response = self.chatgpt_service.client.chat.completions.create(
+                # Streaming: tokens are consumed as they arrive, so transfer
+                # overlaps generation instead of waiting for the last token
+                # before the first byte lands. Routed through _do_call for
+                # the shared retry/backoff handling.
+                stream = self.chatgpt_service._do_call(
                     model=self.chatgpt_service.model,
                     messages=[
                         {"role": "system", "content": "You are a knowledge management task generator. Follow instructions exactly."},
                         {"role": "user", "content": prompt}
                     ],
                     temperature=0.1,
-                    max_tokens=2000
+                    max_tokens=2000,
+                    response_format=_TASKS_RESPONSE_FORMAT,
+                    extra_body=cache_routing,
+                    stream=True,
+                    stream_options={"include_usage": True}
                 )
-            
-            # Extract response content and usage data
-            response_content = response.choices[0].message.content
+                parts = []
+                usage = None
+                for chunk in stream:
+                    if chunk.usage is not None:
+                        usage = chunk.usage
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        parts.append(chunk.choices[0].delta.content)
+                response_content = "".join(parts)
+
             usage_data = {
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens,
-                "total_tokens": response.usage.total_tokens
-            }
+                "prompt_tokens": usage.prompt_tokens,
+                "completion_tokens": usage.completion_tokens,
+                "total_tokens": usage.total_tokens
+            } if usage else None
             
             # Log the response
             self.logger.log_chatgpt_response(response_content, usage_data)
@@ -223,7 +352,8 @@ Do not include any explanation or additional text outside the JSON array."""
             if not tasks:
                 self.logger.warning("No valid tasks generated from ChatGPT response")
                 return []
-                
+
+            self._response_cache[cache_key] = (time.time(), tuple(tasks))
             self.logger.info(f"Successfully generated {len(tasks)} new tasks")
             return tasks
             
@@ -258,16 +388,19 @@ Do not include any explanation or additional text outside the JSON array."""
                     "tasks_stored": 0
                 }
             
-            # Store tasks in database
-            stored_count = 0
-            for task in new_tasks:
-                needs_human = self._analyze_if_task_needs_human(task)
-                success = self.supabase_service.add_task(task, needs_human)
-                if success:
-                    stored_count += 1
-                    self.logger.info(f"Stored task (needs_human={needs_human}): {task[:50]}...")
-                else:
-                    self.logger.warning(f"Failed to store task: {task}")
+            # Classify locally (cheap after the regex rewrite), then store
+            # the whole batch in one insert instead of one request per task
+            rows = [
+                {"title": task, "needs_human": needs_human}
+                for task, needs_human in zip(new_tasks, self.classify_batch(new_tasks))
+            ]
+            if self.supabase_service.add_tasks_bulk(rows):
+                stored_count = len(rows)
+                for row in rows:
+                    self.logger.info(f"Stored task (needs_human={row['needs_human']}): {row['title'][:50]}...")
+            else:
+                stored_count = 0
+                self.logger.warning(f"Failed to store {len(rows)} generated tasks")
             
             self.logger.info(f"Task generation complete: {len(new_tasks)} generated, {stored_count} stored")
             
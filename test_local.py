@@ -16,12 +16,11 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 from knowledge_processor import KnowledgeProcessor
 
 
-def test_system_health():
+def test_system_health(processor):
     """Test system health and configuration."""
     print("🔍 Testing system health...")
     
     try:
-        processor = KnowledgeProcessor()
         health_status = processor.test_system_health()
         
         print(f"Overall Status: {health_status['overall_status']}")
@@ -38,12 +37,11 @@ def test_system_health():
         return False
 
 
-def test_hardcoded_flow():
+def test_hardcoded_flow(processor):
     """Test the hardcoded knowledge processing flow."""
     print("\n🧠 Testing hardcoded knowledge processing flow...")
     
     try:
-        processor = KnowledgeProcessor()
         result = processor.process_hardcoded_flow()
         
         if result.success:
@@ -87,15 +85,19 @@ def main():
     else:
         print("✅ OPENAI_API_KEY found and configured")
     
+    # One processor for all tests: the second test then reuses the warm
+    # service clients (and their connection pools) from the first
+    processor = KnowledgeProcessor()
+
     # Run health check
-    health_ok = test_system_health()
+    health_ok = test_system_health(processor)
     
     if not health_ok:
         print("\n❌ System health check failed. Please fix the issues above before proceeding.")
         return False
     
     # Run hardcoded flow test
-    flow_ok = test_hardcoded_flow()
+    flow_ok = test_hardcoded_flow(processor)
     
     if flow_ok:
         print("\n🎉 All tests passed! Your system is ready for deployment.")